@@ -4,6 +4,9 @@
 
 import sys
 import os
+import queue
+import logging
+import logging.handlers
 from pathlib import Path
 from tkinter import Tk
 import tkinter.messagebox
@@ -12,8 +15,10 @@ from typing import Optional, Dict, Callable, Any  # Added Dict, Callable, Any
 # --- Import Core Application Classes ---
 try:
     from src.ui.interface import UserInterface
-    from src.logic.logic_handler import LogicHandler
+    from src.logic.logic_handler import LogicHandler, shutdown_shared_resources
     from src.logic.history_manager import HistoryManager
+    from src.logic.dns_cache import install_dns_cache
+    from src.logic.downloader_constants import DEFAULT_CONCURRENT_FRAGMENTS
 except ImportError as e:
     print(f"Import Error: {e}")
     print(
@@ -35,8 +40,74 @@ def set_high_dpi_awareness():
         print(f"Could not set DPI awareness: {e}")
 
 
+# --- Logging Setup ---
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Routes log records through a queue so download threads only enqueue them;
+    a background listener does the (slow) console writes.
+    Set DOWNLOADER_DEBUG=1 to include debug records (e.g. final yt-dlp options).
+    """
+    level = logging.DEBUG if os.environ.get("DOWNLOADER_DEBUG") else logging.INFO
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(name)s: %(message)s")
+    )
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, console_handler)
+    listener.start()
+    return listener
+
+
+# --- Download Settings ---
+def _get_int_setting(name: str, default: int) -> int:
+    """Reads a positive integer from environment variable `name`."""
+    raw = os.environ.get(name, "")
+    try:
+        return max(1, int(raw)) if raw else default
+    except ValueError:
+        print(f"Warning: Ignoring invalid {name} value '{raw}'.")
+        return default
+
+
+def get_max_concurrent_tasks() -> int:
+    """
+    Queue tasks downloaded at the same time, from DOWNLOADER_PARALLEL_TASKS.
+    Defaults to 1 (sequential): some hosts throttle parallel connections hard.
+    """
+    return _get_int_setting("DOWNLOADER_PARALLEL_TASKS", 1)
+
+
+def get_max_parallel_videos() -> int:
+    """
+    Playlist items of one task downloaded at the same time, from
+    DOWNLOADER_PARALLEL_VIDEOS. Defaults to 1 (items one after another).
+    """
+    return _get_int_setting("DOWNLOADER_PARALLEL_VIDEOS", 1)
+
+
+def get_concurrent_fragments() -> int:
+    """
+    Parallel DASH/HLS fragment downloads per file, from
+    DOWNLOADER_CONCURRENT_FRAGMENTS; 1 suits slow or metered links.
+    """
+    return _get_int_setting("DOWNLOADER_CONCURRENT_FRAGMENTS", DEFAULT_CONCURRENT_FRAGMENTS)
+
+
+def get_use_aria2() -> bool:
+    """
+    DOWNLOADER_USE_ARIA2=1 hands transfers to aria2c when it is installed.
+    Off by default; YouTube gains little from it.
+    """
+    return os.environ.get("DOWNLOADER_USE_ARIA2", "").strip().lower() in ("1", "true", "yes")
+
+
 # --- Main Execution Block ---
 if __name__ == "__main__":
+    log_listener = setup_logging()
+    install_dns_cache()  # before any yt-dlp network activity
     set_high_dpi_awareness()
 
     # --- Instantiate Application Components ---
@@ -110,7 +181,12 @@ if __name__ == "__main__":
         ),  # Signal Fetch completion
         info_success_callback=app.on_info_success,
         info_error_callback=app.on_info_error,
+        info_entries_callback=app.on_info_entries,
         queue_callbacks=queue_callbacks_dict,  # <<< Pass the dictionary
+        max_concurrent_tasks=get_max_concurrent_tasks(),
+        max_parallel_videos=get_max_parallel_videos(),
+        concurrent_fragments=get_concurrent_fragments(),
+        use_aria2=get_use_aria2(),
     )
 
     # 6. Link the Logic Handler back to the UI instance and finalize UI setup
@@ -157,5 +233,7 @@ if __name__ == "__main__":
         # Ensure cleanup happens even on unexpected exit, might be redundant if on_closing is called
         if "logic" in locals() and logic:
             logic.shutdown()
+        shutdown_shared_resources()  # process-wide pools; only safe once at exit
         if "history_manager" in locals() and history_manager and history_manager.conn:
             history_manager.close_db()
+        log_listener.stop()  # Flushes any queued log records
@@ -0,0 +1,44 @@
+# src/logic/dns_cache.py
+# -- ذاكرة مؤقتة لنتائج DNS على مستوى العملية --
+# Purpose: yt-dlp resolves the same few hosts many times per URL; caching
+# socket.getaddrinfo saves those lookups. Installed explicitly by main.py.
+
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Tuple
+
+_DNS_CACHE_TTL: float = 300.0  # seconds; short enough to follow CDN changes
+_DNS_CACHE_MAX_ENTRIES: int = 256  # least recently used lookups are evicted
+
+_orig_getaddrinfo = socket.getaddrinfo
+# key -> (time.monotonic() when resolved, result); ordered oldest use first.
+_dns_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, Tuple[Any, ...]]]" = OrderedDict()
+_dns_cache_lock = threading.Lock()
+
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    with _dns_cache_lock:
+        hit = _dns_cache.get(key)
+        if hit is not None:
+            if now - hit[0] < _DNS_CACHE_TTL:
+                _dns_cache.move_to_end(key)
+                return list(hit[1])
+            del _dns_cache[key]  # stale: drop it instead of keeping it around
+    # Failures raise and are not cached.
+    result = _orig_getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_cache_lock:
+        _dns_cache[key] = (now, tuple(result))
+        _dns_cache.move_to_end(key)
+        while len(_dns_cache) > _DNS_CACHE_MAX_ENTRIES:
+            _dns_cache.popitem(last=False)
+    return result
+
+
+def install_dns_cache() -> None:
+    """Routes socket.getaddrinfo through the cache (process-wide, idempotent)."""
+    socket.getaddrinfo = _cached_getaddrinfo
+
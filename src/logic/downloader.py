@@ -2,13 +2,17 @@
 # -- ملف يحتوي على كلاس التحميل الرئيسي المنسق --
 # -- Ensure STATUS_COMPLETED from downloader_constants is used --
 
+import copy
+import functools
 import os
 import sys
-import traceback
 import time
-import json
-from pathlib import Path
-from typing import Callable, Dict, Any, Optional, List, Tuple, Union
+import pprint
+import shutil
+import queue
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, ContextManager, Dict, Any, Optional, List, Set
 import threading
 
 import yt_dlp
@@ -29,12 +33,106 @@ from .downloader_constants import (
     STATUS_COMPLETED,
     STATUS_PROCESSING_PREFIX,
     STATUS_WARNING_FFMPEG_MISSING,
+    STATUS_WARNING_FFPROBE_MISSING,
     STATUS_DOWNLOAD_CANCELLED,
     FINAL_MEDIA_EXTENSIONS,
+    FORMAT_AUDIO_MP3,
+    HTTP_CHUNK_SIZE,
+    AUDIO_CONCURRENT_FRAGMENTS,
+    DEFAULT_CONCURRENT_FRAGMENTS,
+    DEFAULT_RETRIES,
+    DEFAULT_FRAGMENT_RETRIES,
+    DEFAULT_SOCKET_TIMEOUT,
+    ARIA2C_ARGS,
+    YTDLP_CACHE_DIR,
+    PROGRESS_FLUSH_INTERVAL,
+    PROGRESS_MIN_DELTA,
     # PP_NAME_*, PP_STATUS_* etc. if needed by hooks
 )
 from .downloader_hooks import ProgressHookHandler, PostprocessorHookHandler
 from .downloader_utils import build_format_string, check_cancel, log_unexpected_error
+from . import ydl_pool
+from .info_fetcher import get_prefetched_entry
+
+log = logging.getLogger(__name__)
+# yt-dlp's screen/debug output; leased instances write here instead of stdout.
+_ydl_log = logging.getLogger("yt_dlp")
+
+
+@functools.lru_cache(maxsize=8)
+def _ffprobe_exists(ffmpeg_dir: str) -> bool:
+    """Whether ffprobe sits next to ffmpeg in ffmpeg_dir (cached per directory)."""
+    ffprobe_name: str = "ffprobe.exe" if sys.platform == "win32" else "ffprobe"
+    return os.path.isfile(os.path.join(ffmpeg_dir, ffprobe_name))
+
+
+@functools.lru_cache(maxsize=1)
+def _aria2c_available() -> bool:
+    """Whether aria2c is on PATH (probed once per process)."""
+    return shutil.which("aria2c") is not None
+
+
+# Save directories already created in this process; the final move still calls
+# os.makedirs, so a folder deleted mid-session is recreated there.
+_ensured_dirs: Set[str] = set()
+_ensured_dirs_lock = threading.Lock()
+
+
+def _ensure_dir(path: str) -> None:
+    with _ensured_dirs_lock:
+        if path in _ensured_dirs:
+            return
+    os.makedirs(path, exist_ok=True)
+    with _ensured_dirs_lock:
+        _ensured_dirs.add(path)
+
+
+_MISSING = object()
+
+
+def _linear_retry_sleep(n: int) -> float:
+    """yt-dlp retry_sleep function: waits 1s, 2s, ... up to 5s (like 'linear=1::5')."""
+    return float(min(n + 1, 5))
+
+
+class _ProgressAggregator:
+    """
+    Wraps a progress callback so it fires at most once per PROGRESS_FLUSH_INTERVAL,
+    and only when the bar moves by at least PROGRESS_MIN_DELTA.
+    Start (0.0) and completion (1.0) are always delivered immediately.
+    """
+
+    def __init__(self, callback: Callable[[float], None]):
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._last_flush: float = 0.0
+        self._last_fraction: float = -1.0
+
+    def __call__(self, fraction: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if 0.0 < fraction < 1.0 and (
+                now - self._last_flush < PROGRESS_FLUSH_INTERVAL
+                or abs(fraction - self._last_fraction) < PROGRESS_MIN_DELTA
+            ):
+                return
+            self._last_flush = now
+            self._last_fraction = fraction
+        self._callback(fraction)
+
+
+class _StatusDeduper:
+    """Wraps a status callback and drops consecutive identical messages."""
+
+    def __init__(self, callback: Callable[[str], None]):
+        self._callback = callback
+        self._last_message: Optional[str] = None
+
+    def __call__(self, message: str) -> None:
+        if message == self._last_message:
+            return
+        self._last_message = message
+        self._callback(message)
 
 
 class Downloader:
@@ -43,6 +141,11 @@ class Downloader:
     Uses task-specific cancel_event and reports status/progress with task_id.
     """
 
+    # Process-wide: the temp path banner and the full options dump are logged by
+    # the first task only; later tasks log just the options that differ.
+    _banner_logged: bool = False
+    _baseline_opts: Optional[Dict[str, Any]] = None
+
     def __init__(
         self,
         task_id: str,
@@ -58,6 +161,14 @@ class Downloader:
         status_callback: Callable[[str], None],
         progress_callback: Callable[[float], None],
         finished_callback: Callable[[], None],
+        concurrent_fragments: int = DEFAULT_CONCURRENT_FRAGMENTS,
+        max_parallel_videos: int = 1,
+        retries: int = DEFAULT_RETRIES,
+        fragment_retries: int = DEFAULT_FRAGMENT_RETRIES,
+        socket_timeout: float = DEFAULT_SOCKET_TIMEOUT,
+        use_aria2: bool = False,
+        prefetched_info: Optional[Dict[str, Any]] = None,
+        isolate_temp_dir: bool = False,
     ):
         self.task_id: str = task_id
         self.url: str = url
@@ -67,26 +178,77 @@ class Downloader:
         self.playlist_items: Optional[str] = playlist_items
         self.selected_items_count: int = selected_items_count
         self.total_playlist_count: int = total_playlist_count
+        # Static part of the playlist progress line, built once per task.
+        self._total_str: str = (
+            f"of {total_playlist_count} total" if total_playlist_count > 0 else ""
+        )
         self.ffmpeg_path: Optional[str] = ffmpeg_path
         self.cancel_event: threading.Event = cancel_event
-        self.status_callback: Callable[[str], None] = status_callback
-        self.progress_callback: Callable[[float], None] = progress_callback
+        # Bound once; polled from run() and from every progress hook tick.
+        self._cancel_is_set: Callable[[], bool] = cancel_event.is_set
+        # Coalesced wrappers: hooks (and parallel shards) may report far faster
+        # than the UI needs; see _ProgressAggregator / _StatusDeduper.
+        self.status_callback: Callable[[str], None] = _StatusDeduper(status_callback)
+        self.progress_callback: Callable[[float], None] = _ProgressAggregator(
+            progress_callback
+        )
         self.finished_callback: Callable[[], None] = finished_callback
+        # Parallel fragment downloads for DASH/HLS; 1 disables (e.g. metered links).
+        self.concurrent_fragments: int = max(1, concurrent_fragments)
+        self.retries: int = max(0, retries)
+        self.fragment_retries: int = max(0, fragment_retries)
+        # Bounds a stalled fragment so the fragment pool keeps moving.
+        self.socket_timeout: float = socket_timeout
+        # Opt-in: hand HTTP/HLS transfers to aria2c when it is installed. Off by
+        # default since YouTube gains little from it and may throttle many connections.
+        self.use_aria2: bool = use_aria2 and _aria2c_available()
+        # Number of playlist items downloaded at the same time (1 = sequential).
+        self.max_parallel_videos: int = max(1, max_parallel_videos)
+        # Playlist info the UI already fetched (InfoFetcher result). When set, the
+        # playlist page is not extracted a second time; entries still resolve fresh.
+        self.prefetched_info: Optional[Dict[str, Any]] = prefetched_info
 
-        self.temp_dir_path: Optional[Path] = get_temp_dir()
+        # ffprobe sits next to ffmpeg; the check is cached per directory.
+        self._ffprobe_ok: bool = bool(
+            self.ffmpeg_path and _ffprobe_exists(os.path.dirname(self.ffmpeg_path))
+        )
+
+        # Kept as a plain str; only os.path is used on it from here on.
+        temp_dir = get_temp_dir()
+        self.temp_dir_path: Optional[str] = os.fspath(temp_dir) if temp_dir else None
+        # Tasks running side by side get their own subfolder so two downloads
+        # of the same title cannot collide on %(title)s.%(ext)s.
+        self._task_temp_dir: Optional[str] = None
+        if self.temp_dir_path and isolate_temp_dir:
+            task_temp_dir = os.path.join(self.temp_dir_path, self.task_id)
+            try:
+                os.makedirs(task_temp_dir, exist_ok=True)
+                self.temp_dir_path = self._task_temp_dir = task_temp_dir
+            except OSError as e:
+                log.warning(
+                    "Downloader Warning (Task %s): Could not create task temp folder, using shared one: %s",
+                    self.task_id,
+                    e,
+                )
         if not self.temp_dir_path:
             self.status_callback(
                 f"{STATUS_ERROR_PREFIX}Could not create/access temporary directory!"
             )
-            print(
-                f"Downloader Warning (Task {self.task_id}): Failed to get temporary directory."
+            log.warning(
+                "Downloader Warning (Task %s): Failed to get temporary directory.",
+                self.task_id,
             )
 
         # --- Internal State Tracking ---
-        self._current_processing_playlist_idx_display: int = 1
-        self._last_hook_playlist_index: int = 0
         self._processed_selected_count: int = 0
+        self._counter_lock = threading.Lock()
         self.last_error_message: Optional[str] = None
+        # Background thread that moves finished files out of the temp folder.
+        self._finalize_queue: Optional["queue.SimpleQueue[Optional[Callable[[], None]]]"] = None
+        self._finalize_thread: Optional[threading.Thread] = None
+
+        # Built once per task; _download_core and the shard workers copy it.
+        self._base_ydl_opts: Dict[str, Any] = self._build_base_ydl_opts()
 
         # --- Initialize Hooks ---
         self.progress_handler = ProgressHookHandler(
@@ -95,34 +257,84 @@ class Downloader:
             progress_callback=self.progress_callback,
         )
         self.postprocessor_handler = PostprocessorHookHandler(downloader=self)
+        # Bound once; the pooled YoutubeDL's hook slots call these directly.
+        self._progress_hook: Callable[[Dict[str, Any]], None] = self.progress_handler.hook
+        self._pp_hook: Callable[[Dict[str, Any]], None] = self.postprocessor_handler.hook
 
-        print(f"Downloader instance initialized for task {self.task_id}.")
-        if self.temp_dir_path:
-            print(
-                f"Downloader (Task {self.task_id}): Using temp path: {self.temp_dir_path}"
-            )
+        log.debug("Downloader instance initialized for task %s.", self.task_id)
+        if self.temp_dir_path and not Downloader._banner_logged:
+            Downloader._banner_logged = True
+            log.info("Downloader: Using temp path: %s", self.temp_dir_path)
+
+    def _clean_name(self, name: str) -> str:
+        """clean_filename() for the status updates and both hook handlers, which
+        see the same titles many times per file (memoised in clean_filename)."""
+        return clean_filename(name)
+
+    # --- File Finalizer (move to save path off the yt-dlp thread) ---
+    def _start_finalizer(self) -> None:
+        self._finalize_queue = queue.SimpleQueue()
+        self._finalize_thread = threading.Thread(
+            target=self._finalize_worker,
+            args=(self._finalize_queue,),
+            name=f"Finalizer-{self.task_id[:8]}",
+            daemon=True,
+        )
+        self._finalize_thread.start()
+
+    @staticmethod
+    def _finalize_worker(jobs: "queue.SimpleQueue[Optional[Callable[[], None]]]") -> None:
+        while (job := jobs.get()) is not None:
+            try:
+                job()
+            except Exception as e:
+                log.error("Downloader Finalizer: Unexpected error: %s", e, exc_info=e)
+
+    def _enqueue_finalize(self, job: Callable[[], None]) -> None:
+        """Queues a file move; runs it inline if no finalizer thread is active."""
+        if self._finalize_queue is None:
+            job()
+        else:
+            self._finalize_queue.put(job)
+
+    def _stop_finalizer(self) -> None:
+        """Waits for every queued move so the completed-item count is final."""
+        if self._finalize_queue is None:
+            return
+        self._finalize_queue.put(None)
+        if self._finalize_thread:
+            self._finalize_thread.join()
+        self._finalize_queue = None
+        self._finalize_thread = None
 
     def _update_status_on_finish_or_process(
         self, filepath: str, info_dict: Dict[str, Any], is_final: bool = False
     ) -> None:
         """Updates status message and increments processed count."""
         base_filename: str = os.path.basename(filepath)
-        file_path_obj = Path(filepath)
-        file_ext_lower: str = file_path_obj.suffix.lower()
-        final_ext_present: bool = file_ext_lower in FINAL_MEDIA_EXTENSIONS
-
         title: Optional[str] = info_dict.get("title")
-        display_name: str = clean_filename(title or base_filename)
         playlist_index: Optional[int] = info_dict.get("playlist_index")
 
-        if self.is_playlist and playlist_index is not None and is_final:
-            display_name = clean_filename(f"{playlist_index}. {display_name}")
-        elif not title:
+        display_name: str
+        if is_final and self.is_playlist and playlist_index is not None:
+            display_name = self._clean_name(
+                f"{playlist_index}. {self._clean_name(title or base_filename)}"
+            )
+        elif title:
+            display_name = self._clean_name(title)
+        else:
             display_name = base_filename
 
+        # Only a finalized file can count as completed; skip the suffix check otherwise.
+        dot: int = base_filename.rfind(".")
+        final_ext_present: bool = (
+            is_final and dot > 0 and base_filename[dot:].lower() in FINAL_MEDIA_EXTENSIONS
+        )
+
         status_msg: str
         if is_final and final_ext_present:
-            self._processed_selected_count += 1
+            with self._counter_lock:
+                self._processed_selected_count += 1
             # <<< استخدام الثابت الصحيح من downloader_constants >>>
             status_msg = f"{STATUS_COMPLETED}: {display_name}"
         else:
@@ -130,84 +342,346 @@ class Downloader:
 
         self.status_callback(status_msg)
         if is_final:
-            print(
-                f"Downloader Internal Status (Task {self.task_id}): Finalized '{display_name}' (Counter: {self._processed_selected_count})"
+            log.info(
+                "Downloader Internal Status (Task %s): Finalized '%s' (Counter: %d)",
+                self.task_id,
+                display_name,
+                self._processed_selected_count,
             )
 
-    # --- (باقي الدوال _download_core و run تبقى كما هي من الإصدار السابق) ---
-    def _download_core(self) -> None:
-        """Executes the core download, directing output to the temp directory."""
-        self._current_processing_playlist_idx_display = 1
-        self._last_hook_playlist_index = 0
-        self._processed_selected_count = 0
-        self.last_error_message = None
-        check_cancel(
-            self.cancel_event, f"(Task {self.task_id}) before starting download"
+    @staticmethod
+    def _parse_playlist_indices(items_str: str) -> Optional[List[int]]:
+        """
+        Expands a playlist_items string ("1,2,5-7") into a list of indices.
+        Returns None for syntax we don't expand (steps, negative indices).
+        """
+        indices: List[int] = []
+        for part in items_str.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            start, sep, end = part.partition("-")
+            if not start.isdigit() or (sep and not end.isdigit()):
+                return None
+            if sep:
+                indices.extend(range(int(start), int(end) + 1))
+            else:
+                indices.append(int(start))
+        return indices
+
+    @classmethod
+    def _apply_playlist_selection(cls, ydl_opts: Dict[str, Any], items_str: str) -> None:
+        """
+        Sets the playlist selection on ydl_opts. Contiguous selections use
+        playliststart/playlistend so yt-dlp can start before resolving later items.
+        """
+        for key in ("playlist_items", "playliststart", "playlistend"):
+            ydl_opts.pop(key, None)
+        indices = cls._parse_playlist_indices(items_str)
+        if indices and indices == list(range(indices[0], indices[-1] + 1)):
+            ydl_opts["playliststart"] = indices[0]
+            ydl_opts["playlistend"] = indices[-1]
+        else:
+            ydl_opts["playlist_items"] = items_str
+
+    @classmethod
+    def _shard_playlist_items(cls, items_str: str, workers: int) -> List[str]:
+        """
+        Splits a playlist_items string ("1,2,5-7") into up to `workers` contiguous shards.
+        Returns the original string unsplit if it uses syntax we don't expand (steps, negatives).
+        """
+        indices = cls._parse_playlist_indices(items_str)
+        if not indices or len(indices) < 2 or workers < 2:
+            return [items_str]
+        shard_count = min(workers, len(indices))
+        shard_size, remainder = divmod(len(indices), shard_count)
+        shards: List[str] = []
+        pos = 0
+        for i in range(shard_count):
+            size = shard_size + (1 if i < remainder else 0)
+            shards.append(",".join(map(str, indices[pos : pos + size])))
+            pos += size
+        return shards
+
+    # --- YoutubeDL Reuse ---
+    # Per-lease ydl_opts, kept out of the pool key: the playlist selection and
+    # the output template (which differs per task when temp folders are isolated).
+    _PER_CALL_KEYS = ("playlist_items", "playliststart", "playlistend", "outtmpl")
+
+    def _lease_ydl(
+        self,
+        ydl_opts: Dict[str, Any],
+        progress_hook: Callable[[Dict[str, Any]], None],
+        postprocessor_hook: Callable[[Dict[str, Any]], None],
+    ) -> ContextManager[yt_dlp.YoutubeDL]:
+        """
+        Leases a process-wide pooled YoutubeDL for ydl_opts (see ydl_pool), so
+        instances and their connections outlive the task. The playlist
+        selection and output template are applied to the live params on every
+        lease.
+        """
+        return ydl_pool.lease(
+            ydl_opts, progress_hook, postprocessor_hook, per_call=self._PER_CALL_KEYS
+        )
+
+    def _ydl_download(self, ydl: yt_dlp.YoutubeDL) -> None:
+        """Runs the download, reusing the prefetched info when available."""
+        if self.prefetched_info is not None:
+            # process_ie_result mutates the result; give each run its own copy.
+            info: Dict[str, Any] = copy.deepcopy(self.prefetched_info)
+            entries = info.get("entries")
+            if isinstance(entries, list):
+                # Entries InfoFetcher already resolved skip their extraction here.
+                for i, entry in enumerate(entries):
+                    if isinstance(entry, dict):
+                        resolved = get_prefetched_entry(entry.get("id"))
+                        if resolved is not None:
+                            entries[i] = resolved
+            ydl.process_ie_result(info, download=True)
+        else:
+            ydl.download([self.url])
+
+    def _download_shards(self, ydl_opts: Dict[str, Any], shards: List[str]) -> None:
+        """Downloads playlist shards in parallel, each with its own YoutubeDL and hook state."""
+
+        # Latest per-item fraction of each shard; combined into one task-level value
+        # so parallel shards don't fight over the progress bar.
+        shard_fractions: Dict[int, float] = {}
+        fractions_lock = threading.Lock()
+        total_selected: int = max(1, self.selected_items_count)
+        # Highest value reported so far: an item leaves shard_fractions (see
+        # _shard_pp_hook) slightly before the finalizer counts it as done.
+        reported: float = 0.0
+
+        def _report_total() -> None:
+            nonlocal reported
+            with fractions_lock:
+                in_flight = sum(shard_fractions.values())
+                done = self._processed_selected_count
+                value = min(1.0, (done + in_flight) / total_selected)
+                if value <= reported:
+                    return
+                reported = value
+            self.progress_callback(value)
+
+        def _shard_progress(slot: int) -> Callable[[float], None]:
+            def report(fraction: float) -> None:
+                with fractions_lock:
+                    shard_fractions[slot] = fraction
+                _report_total()
+
+            return report
+
+        def _shard_pp_hook(
+            slot: int, handler: PostprocessorHookHandler
+        ) -> Callable[[Dict[str, Any]], None]:
+            def hook(d: Dict[str, Any]) -> None:
+                handler.hook(d)
+                # The item is about to be counted in _processed_selected_count;
+                # stop adding its in-flight fraction on top of that.
+                if (
+                    d.get("status") == "finished"
+                    and d.get("postprocessor") in handler.FINAL_POSTPROCESSORS
+                ):
+                    with fractions_lock:
+                        shard_fractions.pop(slot, None)
+
+            return hook
+
+        def _download_shard(slot: int, shard: str) -> None:
+            check_cancel(
+                self.cancel_event, "(Task %s) before shard '%s'", self.task_id, shard
+            )
+            progress_handler = ProgressHookHandler(
+                downloader=self,
+                status_callback=self.status_callback,
+                progress_callback=_shard_progress(slot),
+            )
+            postprocessor_handler = PostprocessorHookHandler(downloader=self)
+            shard_opts: Dict[str, Any] = dict(ydl_opts)
+            self._apply_playlist_selection(shard_opts, shard)
+            try:
+                with self._lease_ydl(
+                    shard_opts,
+                    progress_handler.hook,
+                    _shard_pp_hook(slot, postprocessor_handler),
+                ) as ydl:
+                    self._ydl_download(ydl)
+            finally:
+                postprocessor_handler.queue_pending_move()
+                with fractions_lock:
+                    shard_fractions.pop(slot, None)
+
+        log.info(
+            "Downloader (Task %s): Downloading %d playlist shards in parallel: %s",
+            self.task_id,
+            len(shards),
+            shards,
+        )
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(shards), self.max_parallel_videos),
+            thread_name_prefix=f"Downloader-{self.task_id[:8]}",
         )
-        save_path_obj: Path = Path(self.save_path)
         try:
-            save_path_obj.mkdir(parents=True, exist_ok=True)
-        except OSError as e:
-            err_msg = f"Cannot create final save directory: {e}"
-            self.status_callback(f"{STATUS_ERROR_PREFIX}{err_msg}")
-            self.last_error_message = err_msg
+            futures = [
+                executor.submit(_download_shard, slot, shard)
+                for slot, shard in enumerate(shards)
+            ]
+            for future in as_completed(futures):
+                # Re-raises the first failure/cancellation from a worker.
+                future.result()
+        except BaseException:
+            # Drop shards that haven't started; running ones stop via cancel_event.
+            executor.shutdown(wait=True, cancel_futures=True)
             raise
+        executor.shutdown(wait=True)
+
+    def _build_base_ydl_opts(self) -> Dict[str, Any]:
+        """
+        yt-dlp options shared by every run/shard of this task. Hooks and the
+        playlist selection are added per lease (see _lease_ydl).
+        """
         final_format_string, output_ext_hint, core_postprocessors = build_format_string(
             self.format_choice, self.ffmpeg_path
         )
         ydl_opts: Dict[str, Any] = {
-            "progress_hooks": [self.progress_handler.hook],
-            "postprocessor_hooks": [self.postprocessor_handler.hook],
             "nocheckcertificate": True,
             "ignoreerrors": self.is_playlist,
             "merge_output_format": output_ext_hint or "mp4",
-            "postprocessors": core_postprocessors,
+            # build_format_string() is cached; copy so tasks never share the dicts.
+            "postprocessors": [dict(pp) for pp in core_postprocessors],
             "restrictfilenames": False,
             "keepvideo": False,
-            "retries": 5,
-            "fragment_retries": 5,
-            "concurrent_fragment_downloads": 4,
+            "retries": self.retries,
+            # Parallel fragment sockets fail more often; retry those generously.
+            "fragment_retries": self.fragment_retries,
+            "extractor_retries": 1,
+            # Short linear backoff (1s, 2s, ... capped at 5s) instead of retrying instantly.
+            "retry_sleep_functions": {
+                "http": _linear_retry_sleep,
+                "fragment": _linear_retry_sleep,
+                "extractor": _linear_retry_sleep,
+            },
+            # Windows AV/indexers briefly lock fresh files; retry file access.
+            "file_access_retries": 5,
+            "socket_timeout": self.socket_timeout,
+            "http_chunk_size": HTTP_CHUNK_SIZE,
+            # Progress is reported through our hooks; skip yt-dlp's console bar.
+            "noprogress": True,
+            "no_color": True,
+            "logger": _ydl_log,
+            # Persist yt-dlp's player/signature cache at a fixed, app-owned path
+            # (also for frozen builds) so warm runs skip player JS parsing.
+            "cachedir": YTDLP_CACHE_DIR,
         }
-        if self.temp_dir_path and self.temp_dir_path.is_dir():
-            outtmpl_pattern = str(self.temp_dir_path / "%(title)s.%(ext)s")
+        if self.temp_dir_path and os.path.isdir(self.temp_dir_path):
+            outtmpl_pattern = os.path.join(self.temp_dir_path, "%(title)s.%(ext)s")
         else:
-            outtmpl_pattern = str(save_path_obj / "%(title)s.%(ext)s")
-            print(
-                f"Downloader Warning (Task {self.task_id}): Using final path template."
+            outtmpl_pattern = os.path.join(self.save_path, "%(title)s.%(ext)s")
+            log.warning(
+                "Downloader Warning (Task %s): Using final path template.", self.task_id
             )
             self.temp_dir_path = None
-        ydl_opts["outtmpl"] = outtmpl_pattern
+        # Dict form: applied per lease onto an already-initialised YoutubeDL,
+        # which no longer normalises a plain string template.
+        ydl_opts["outtmpl"] = {"default": outtmpl_pattern}
         if self.ffmpeg_path:
             ydl_opts["ffmpeg_location"] = self.ffmpeg_path
-        elif core_postprocessors:
-            self.status_callback(STATUS_WARNING_FFMPEG_MISSING)
-        if self.is_playlist and self.playlist_items:
-            ydl_opts["playlist_items"] = self.playlist_items
+        # Audio-only streams are small but may still be HLS-fragmented (e.g.
+        # SoundCloud); a low cap keeps them parallel without flooding the host.
+        if self.format_choice == FORMAT_AUDIO_MP3:
+            ydl_opts["concurrent_fragment_downloads"] = min(
+                self.concurrent_fragments, AUDIO_CONCURRENT_FRAGMENTS
+            )
+        else:
+            ydl_opts["concurrent_fragment_downloads"] = self.concurrent_fragments
+        if self.use_aria2:
+            ydl_opts["external_downloader"] = {"http": "aria2c", "m3u8": "aria2c"}
+            ydl_opts["external_downloader_args"] = {"aria2c": list(ARIA2C_ARGS)}
+        if self.is_playlist:
+            # Stream entries so the first item starts before the whole list resolves.
+            ydl_opts["lazy_playlist"] = True
         if final_format_string:
             ydl_opts["format"] = final_format_string
-        elif "format" in ydl_opts:
-            del ydl_opts["format"]
-        print(f"\n--- Final yt-dlp options (Task {self.task_id}) ---")
-        print(json.dumps(ydl_opts, indent=2, default=str))
-        print("---\n")
+        # Compiled out entirely under `python -O`; otherwise only with DEBUG logging.
+        if __debug__:
+            if log.isEnabledFor(logging.DEBUG):
+                self._log_opts(ydl_opts)
+        return ydl_opts
+
+    def _log_opts(self, ydl_opts: Dict[str, Any]) -> None:
+        """Debug dump: full options once per process, then only the differences."""
+        baseline = Downloader._baseline_opts
+        if baseline is None:
+            Downloader._baseline_opts = ydl_opts
+            log.debug(
+                "Base yt-dlp options (Task %s):\n%s",
+                self.task_id,
+                pprint.pformat(ydl_opts, compact=True),
+            )
+            return
+        changed = {k: v for k, v in ydl_opts.items() if baseline.get(k, _MISSING) != v}
+        removed = [k for k in baseline if k not in ydl_opts]
+        log.debug(
+            "Base yt-dlp options (Task %s): same as first task except %s%s",
+            self.task_id,
+            pprint.pformat(changed, compact=True),
+            f", without {removed}" if removed else "",
+        )
+
+    def _download_core(self) -> None:
+        """Executes the core download, directing output to the temp directory."""
+        self._processed_selected_count = 0
+        self.last_error_message = None
+        check_cancel(
+            self.cancel_event, "(Task %s) before starting download", self.task_id
+        )
+        try:
+            _ensure_dir(self.save_path)
+        except OSError as e:
+            err_msg = f"Cannot create final save directory: {e}"
+            self.status_callback(f"{STATUS_ERROR_PREFIX}{err_msg}")
+            self.last_error_message = err_msg
+            raise
+        ydl_opts: Dict[str, Any] = dict(self._base_ydl_opts)
+        if self.ffmpeg_path:
+            if not self._ffprobe_ok:
+                self.status_callback(STATUS_WARNING_FFPROBE_MISSING)
+        elif ydl_opts["postprocessors"]:
+            self.status_callback(STATUS_WARNING_FFMPEG_MISSING)
+        if self.is_playlist and self.playlist_items:
+            self._apply_playlist_selection(ydl_opts, self.playlist_items)
         self.status_callback(STATUS_STARTING_DOWNLOAD)
         self.progress_callback(0.0)
         check_cancel(
             self.cancel_event,
-            f"(Task {self.task_id}) right before calling ydl.download()",
+            "(Task %s) right before calling ydl.download()",
+            self.task_id,
         )
+        shards: List[str] = (
+            self._shard_playlist_items(self.playlist_items, self.max_parallel_videos)
+            if self.is_playlist and self.playlist_items
+            else []
+        )
+        self._start_finalizer()
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([self.url])
+            if len(shards) > 1:
+                self._download_shards(ydl_opts, shards)
+            else:
+                with self._lease_ydl(
+                    ydl_opts, self._progress_hook, self._pp_hook
+                ) as ydl:
+                    self._ydl_download(ydl)
             check_cancel(
                 self.cancel_event,
-                f"(Task {self.task_id}) immediately after ydl.download() finished",
+                "(Task %s) immediately after ydl.download() finished",
+                self.task_id,
             )
         except YtdlpDownloadCancelled as e:
             raise DownloadCancelled(str(e) or "Download cancelled by hook.") from e
         except (YtdlpDownloadError, YtdlpExtractorError) as dl_err:
             error_message = str(dl_err)
-            print(f"Downloader yt-dlp Error (Task {self.task_id}): {dl_err}")
+            log.error("Downloader yt-dlp Error (Task %s): %s", self.task_id, dl_err)
             if "ERROR:" in error_message:
                 error_message = error_message.split("ERROR:")[-1].strip()
             self.last_error_message = error_message
@@ -221,6 +695,10 @@ class Downloader:
                 f"during yt-dlp download execution (Task {self.task_id})",
             )
             self.last_error_message = f"Unexpected Error: {type(e).__name__}"
+        finally:
+            # Normally queued by MoveFiles; don't lose a move if that never ran.
+            self.postprocessor_handler.queue_pending_move()
+            self._stop_finalizer()
 
     def run(self) -> None:
         """Main entry point for running the download task."""
@@ -230,32 +708,39 @@ class Downloader:
             self._download_core()
             check_cancel(
                 self.cancel_event,
-                f"(Task {self.task_id}) after _download_core completed",
+                "(Task %s) after _download_core completed",
+                self.task_id,
             )
-            print(f"Downloader (Task {self.task_id}): _download_core completed.")
-            if not self.cancel_event.is_set() and not self.last_error_message:
+            log.info("Downloader (Task %s): _download_core completed.", self.task_id)
+            if not self._cancel_is_set() and not self.last_error_message:
                 all_processed = (
                     self._processed_selected_count >= self.selected_items_count
                 )
                 if all_processed:
                     self.progress_callback(1.0)
-                    print(
-                        f"Downloader (Task {self.task_id}): Run completed successfully."
+                    log.info(
+                        "Downloader (Task %s): Run completed successfully.", self.task_id
                     )
                 else:
-                    print(
-                        f"Downloader Warning (Task {self.task_id}): Processed {self._processed_selected_count}/{self.selected_items_count} items."
+                    log.warning(
+                        "Downloader Warning (Task %s): Processed %d/%d items.",
+                        self.task_id,
+                        self._processed_selected_count,
+                        self.selected_items_count,
                     )
         except DownloadCancelled as e:
             was_cancelled = True
             cancel_msg = str(e) or STATUS_DOWNLOAD_CANCELLED
             self.status_callback(cancel_msg)
-            print(
-                f"Downloader Run (Task {self.task_id}): Caught DownloadCancelled: {e}"
+            log.info(
+                "Downloader Run (Task %s): Caught DownloadCancelled: %s", self.task_id, e
             )
         except Exception as e:
-            print(
-                f"Downloader Run (Task {self.task_id}): Caught unexpected exception: {type(e).__name__}: {e}"
+            log.error(
+                "Downloader Run (Task %s): Caught unexpected exception: %s: %s",
+                self.task_id,
+                type(e).__name__,
+                e,
             )
             if not self.last_error_message:
                 self.last_error_message = f"Unexpected Error: {type(e).__name__}"
@@ -265,7 +750,25 @@ class Downloader:
                 self.status_callback(f"{STATUS_ERROR_PREFIX}{self.last_error_message}")
         finally:
             end_time = time.time()
-            print(
-                f"Downloader (Task {self.task_id}): Reached finally block after {end_time - start_time:.2f}s. Cancelled={was_cancelled}, Error='{self.last_error_message}'"
+            log.info(
+                "Downloader (Task %s): Reached finally block after %.2fs. Cancelled=%s, Error='%s'",
+                self.task_id,
+                end_time - start_time,
+                was_cancelled,
+                self.last_error_message,
             )
+            self._remove_task_temp_dir()
             self.finished_callback()
+
+    def _remove_task_temp_dir(self) -> None:
+        """Removes this task's temp subfolder once it is empty (leftovers keep it)."""
+        if not self._task_temp_dir:
+            return
+        try:
+            os.rmdir(self._task_temp_dir)
+        except OSError:
+            log.debug(
+                "Downloader (Task %s): Task temp folder kept (not empty): %s",
+                self.task_id,
+                self._task_temp_dir,
+            )
@@ -1,7 +1,8 @@
 # src/logic/downloader_constants.py
 # -- ملف يحتوي على الثوابت المستخدمة في عملية التحميل --
 
-from typing import Set
+import os
+from typing import FrozenSet, Tuple
 
 # --- Status Messages ---
 STATUS_STARTING_DOWNLOAD: str = "Starting download..."
@@ -18,7 +19,7 @@ STATUS_WARNING_FFMPEG_MISSING: str = (
     "Warning: FFmpeg needed but not found. Conversion/Merging might fail."
 )
 STATUS_WARNING_FFPROBE_MISSING: str = (
-    "Warning: ffprobe.exe might be missing. Some features may not work."
+    "Warning: ffprobe might be missing. Some features may not work."
 )
 STATUS_RENAME_FAILED_WARNING: str = (
     "Warning: Could not rename '{filename}'. Error: {error}"
@@ -49,7 +50,7 @@ DEFAULT_CLEANED_FILENAME: str = "downloaded_file"
 
 
 # --- File Extensions ---
-FINAL_MEDIA_EXTENSIONS: Set[str] = {
+FINAL_MEDIA_EXTENSIONS: FrozenSet[str] = frozenset({
     ".mp4",
     ".mp3",
     ".mkv",
@@ -63,10 +64,35 @@ FINAL_MEDIA_EXTENSIONS: Set[str] = {
     ".aac",
     ".mov",
     ".wmv",
-}
+})
 
 # --- Format Choices ---
 FORMAT_AUDIO_MP3: str = "Download Audio Only (MP3)"
 
+# --- Network Tuning ---
+HTTP_CHUNK_SIZE: int = 10 * 1024 * 1024  # 10 MiB per HTTP range request
+DEFAULT_CONCURRENT_FRAGMENTS: int = 16  # parallel DASH/HLS fragment downloads
+AUDIO_CONCURRENT_FRAGMENTS: int = 4  # cap for audio-only (HLS audio) streams
+DEFAULT_RETRIES: int = 2  # whole-request retries; low so dead items fail fast
+DEFAULT_FRAGMENT_RETRIES: int = 10  # per-fragment retries for parallel sockets
+DEFAULT_SOCKET_TIMEOUT: float = 15.0  # seconds before a stalled connection is retried
+# aria2c (optional external downloader): 16 connections, 1 MiB ranges.
+ARIA2C_ARGS: Tuple[str, ...] = ("-x", "16", "-s", "16", "-k", "1M")
+# Queue tasks downloaded side by side; 1 keeps the queue sequential since some
+# hosts throttle hard on parallel connections.
+DEFAULT_MAX_CONCURRENT_TASKS: int = 1
+MAX_CONCURRENT_TASKS_LIMIT: int = 8
+
+# --- Caches ---
+# Shared by InfoFetcher and Downloader; yt-dlp keeps its extracted YouTube
+# player signature functions here between runs.
+APP_CACHE_DIR: str = os.path.join(os.path.expanduser("~"), ".asf_cache")
+YTDLP_CACHE_DIR: str = os.path.join(APP_CACHE_DIR, "yt-dlp")
+
+# --- UI Update Throttling ---
+UI_UPDATE_INTERVAL: float = 0.1  # seconds between "downloading" status updates
+PROGRESS_FLUSH_INTERVAL: float = 0.2  # seconds between progress bar updates
+PROGRESS_MIN_DELTA: float = 0.005  # smallest bar change (0.5%) worth sending to the UI
+
 # --- Core Status Constants ---
 STATUS_COMPLETED: str = "Completed"  # <<< تمت إضافة هذا الثابت
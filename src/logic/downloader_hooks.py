@@ -3,25 +3,87 @@
 # -- Corrected FINAL_POSTPROCESSORS list for accurate move/rename trigger --
 
 import os
+import re
+import sys
+import errno
+import functools
 import time
-import humanize
+import logging
 import contextlib
 import shutil  # لاستخدام shutil.move
-from pathlib import Path
-from typing import Callable, Dict, Any, Optional, List, Union, TYPE_CHECKING
-import threading
+from typing import Callable, Dict, Any, Optional, Set, Union, TYPE_CHECKING
 
 from yt_dlp.utils import DownloadCancelled as YtdlpDownloadCancelled
 
 # --- Imports from current package ---
 from .exceptions import DownloadCancelled
-from .utils import clean_filename
 from .downloader_constants import *
 from .downloader_utils import check_cancel
 
 if TYPE_CHECKING:
     from .downloader import Downloader
 
+log = logging.getLogger(__name__)
+
+# Matches anything clean_filename() would change: invalid characters, control or
+# non-space whitespace, repeated spaces, and leading/trailing spaces or dots.
+_NEEDS_CLEANING_RE = re.compile(r'[\\/*?:"<>|]|[^\S ]|  |^ |[ .]$')
+
+# --- Size Formatting (replaces humanize.naturalsize on the progress path) ---
+_UNITS = ("KiB", "MiB", "GiB", "TiB", "PiB")
+_UNITS_GNU = ("K", "M", "G", "T", "P")
+
+
+def _unit_exponent(n: float) -> int:
+    """Power of 1024 for n >= 1024, capped at the largest unit (PiB); no loop."""
+    return min((int(n).bit_length() - 1) // 10, len(_UNITS))
+
+
+def _fmt_bytes(n: float) -> str:
+    """Binary size like humanize.naturalsize(n, binary=True): '1.5 MiB'."""
+    if n < 1024:
+        return "1 Byte" if int(n) == 1 else f"{int(n)} Bytes"
+    exp = _unit_exponent(n)
+    return f"{n / (1 << (exp * 10)):.1f} {_UNITS[exp - 1]}"
+
+
+def _fmt_bytes_gnu(n: float) -> str:
+    """GNU-style binary size (used for speeds): '1.5M'."""
+    if n < 1024:
+        return f"{int(n)}B"
+    exp = _unit_exponent(n)
+    return f"{n / (1 << (exp * 10)):.1f}{_UNITS_GNU[exp - 1]}"
+
+
+# Fixed "started" status per postprocessor, keyed by the names the hook reports
+# (see PostprocessorHookHandler.FINAL_POSTPROCESSORS). FFmpegExtractAudio needs
+# the target codec and MoveFiles is internal, so neither is listed here.
+_PP_STARTED_STATUS: Dict[str, str] = {
+    "Merger": PP_STATUS_MERGING,
+    "FFmpegVideoConvertor": PP_STATUS_CONVERTING_VIDEO,
+}
+
+# HH:MM:SS wraps at a day; longer ETAs (and inf/NaN, which int() rejects) show
+# as "Calculating..." instead.
+_MAX_ETA_SECONDS: float = 86400.0
+
+# Windows and macOS filesystems are case-insensitive by default.
+_CASE_INSENSITIVE_FS: bool = sys.platform in ("win32", "darwin")
+
+# On Windows, AV scanners/indexers can hold a fresh file open for a moment, so a
+# locked move is retried with a short backoff. POSIX renames need no delay.
+_RETRY_LOCKED_MOVES: bool = os.name == "nt"
+_MOVE_ATTEMPTS: int = 3
+_MOVE_RETRY_DELAY: float = 0.05  # seconds; grows linearly per attempt
+
+
+def _is_same_path(a: str, b: str) -> bool:
+    """True if both paths name the same file (case-insensitively on Windows/macOS)."""
+    if a == b:
+        return True
+    a, b = os.path.abspath(a), os.path.abspath(b)
+    return a.lower() == b.lower() if _CASE_INSENSITIVE_FS else a == b
+
 
 class ProgressHookHandler:
     """
@@ -29,6 +91,15 @@ class ProgressHookHandler:
     يحاول حساب التقدم المجمع إذا كانت المعلومات متوفرة.
     """
 
+    # --- Status templates (one str.format per displayed tick) ---
+    _TPL_STATUS = (
+        "{header}\n"
+        "Current File: {pct} ({done} / {total})\n"
+        "Speed: {speed} | ETA: {eta}"
+    )
+    _TPL_SELECTION = "Selected: {sel_i} of {sel_n} ({rem} remaining)"
+    _SINGLE_HEADER = "Downloading Media"
+
     # --- كود ProgressHookHandler يبقى كما هو من الإصدار السابق (لا يحتاج تعديل هنا) ---
     def __init__(
         self,
@@ -41,12 +112,25 @@ class ProgressHookHandler:
         self.progress_callback: Callable[[float], None] = progress_callback
         self._total_size_estimate: Optional[float] = None
         self._last_artifact_filename_hook: Optional[str] = None
+        # Playlist item this handler is reporting on. Kept per handler, not on
+        # the Downloader: parallel shards each walk their own range of items.
+        self._playlist_index: int = 0
+        # Bound once: the hook checks cancellation on every yt-dlp tick.
+        self._cancel_is_set: Callable[[], bool] = downloader._cancel_is_set
+        # Fixed for the task; read on every tick.
+        self._is_playlist: bool = downloader.is_playlist
+        # Monotonic time of the last "downloading" UI update (see UI_UPDATE_INTERVAL).
+        self._last_ui_update: float = 0.0
+        # Cached "Selected: ..." line and the processed count it was built for.
+        self._selection_line: str = ""
+        self._selection_line_count: int = -1
+        # The artifact's total size rarely changes between ticks; format it once.
+        self._total_bytes_cached: Optional[int] = None
+        self._total_size_str_cached: str = "Unknown size"
 
     def hook(self, d: Dict[str, Any]) -> None:
-        try:
-            check_cancel(self.downloader.cancel_event, "during progress hook")
-        except DownloadCancelled as e:
-            raise YtdlpDownloadCancelled(str(e)) from e
+        if self._cancel_is_set():
+            raise YtdlpDownloadCancelled("Download cancelled during progress hook.")
 
         status: Optional[str] = d.get("status")
         info_dict: Dict[str, Any] = d.get("info_dict", {})
@@ -59,17 +143,12 @@ class ProgressHookHandler:
         ):
             self._last_artifact_filename_hook = current_hook_filename
 
-        if (
-            self.downloader.is_playlist
-            and hook_playlist_index is not None
-            and hook_playlist_index > self.downloader._last_hook_playlist_index
-        ):
-            self.downloader._current_processing_playlist_idx_display = (
-                hook_playlist_index
-            )
-            self.downloader._last_hook_playlist_index = hook_playlist_index
-            self._total_size_estimate = None
-            self._last_artifact_filename_hook = None
+        if self._is_playlist and hook_playlist_index is not None:
+            if hook_playlist_index > self._playlist_index:
+                self._playlist_index = hook_playlist_index
+                self._total_size_estimate = None
+                self._last_artifact_filename_hook = None
+                self._last_ui_update = 0.0
 
         if status == "finished":
             if filepath := info_dict.get("filepath") or d.get("filename"):
@@ -80,7 +159,16 @@ class ProgressHookHandler:
                 self.status_callback(STATUS_PROCESSING_FILE)
 
         elif status == "downloading":
+            # Coalesce fast ticks before any other work: at most one UI update per
+            # interval (including "Connecting..."), but always let the tick that
+            # completes the artifact through.
+            now = time.monotonic()
             downloaded_bytes: Optional[int] = d.get("downloaded_bytes")
+            if now - self._last_ui_update < UI_UPDATE_INTERVAL and (
+                downloaded_bytes is None or downloaded_bytes != d.get("total_bytes")
+            ):
+                return
+            self._last_ui_update = now
             if downloaded_bytes is not None:
                 current_total_estimate = d.get("_total_filesize_estimate")
                 if current_total_estimate is not None and current_total_estimate > 0:
@@ -88,8 +176,9 @@ class ProgressHookHandler:
                         self._total_size_estimate is None
                         or self._total_size_estimate != current_total_estimate
                     ):
-                        print(
-                            f"ProgressHook: Using total size estimate: {humanize.naturalsize(current_total_estimate, binary=True)}"
+                        log.debug(
+                            "ProgressHook: Using total size estimate: %s",
+                            _fmt_bytes(current_total_estimate),
                         )
                         self._total_size_estimate = float(current_total_estimate)
                     progress = downloaded_bytes / self._total_size_estimate
@@ -97,7 +186,7 @@ class ProgressHookHandler:
                     self.progress_callback(progress)
                 else:
                     if self._total_size_estimate is not None:
-                        print(
+                        log.debug(
                             "ProgressHook: Total estimate N/A. Reverting to per-artifact progress."
                         )
                         self._total_size_estimate = None
@@ -116,8 +205,9 @@ class ProgressHookHandler:
 
         elif status == "error":
             self.status_callback(STATUS_ERROR_YT_DLP)
-            print(
-                f"yt-dlp hook reported error: {d.get('error', 'Unknown yt-dlp error')}"
+            log.error(
+                "yt-dlp hook reported error: %s",
+                d.get('error', 'Unknown yt-dlp error'),
             )
 
     def _format_and_display_download_status(
@@ -132,71 +222,73 @@ class ProgressHookHandler:
                 0.0, min(1.0, downloaded_bytes / total_bytes_artifact)
             )
             percentage_str_artifact = f"{progress_artifact:.1%}"
-        status_lines: List[str] = []
-        if self.downloader.is_playlist:
-            self._format_playlist_progress_status(status_lines, d.get("info_dict", {}))
-        else:
-            status_lines.append("Downloading Media")
-        downloaded_size_str: str = humanize.naturalsize(downloaded_bytes, binary=True)
-        total_size_str_artifact: str = (
-            humanize.naturalsize(total_bytes_artifact, binary=True)
-            if total_bytes_artifact
-            else "Unknown size"
-        )
-        status_lines.append(
-            f"Current File: {percentage_str_artifact} ({downloaded_size_str} / {total_size_str_artifact})"
+        header: str = (
+            self._playlist_header(d.get("info_dict", {}))
+            if self._is_playlist
+            else self._SINGLE_HEADER
         )
+        downloaded_size_str: str = _fmt_bytes(downloaded_bytes)
+        if total_bytes_artifact != self._total_bytes_cached:
+            self._total_bytes_cached = total_bytes_artifact
+            self._total_size_str_cached = (
+                _fmt_bytes(total_bytes_artifact)
+                if total_bytes_artifact
+                else "Unknown size"
+            )
+        total_size_str_artifact: str = self._total_size_str_cached
         speed: Optional[float] = d.get("speed")
         speed_str: str = (
-            f"{humanize.naturalsize(speed, binary=True, gnu=True)}/s"
+            f"{_fmt_bytes_gnu(speed)}/s"
             if speed
             else "Calculating..."
         )
         eta: Optional[Union[int, float]] = d.get("eta")
         eta_str: str = "Calculating..."
-        with contextlib.suppress(TypeError, ValueError):
-            if eta is not None and isinstance(eta, (int, float)) and eta >= 0:
-                td = time.gmtime(int(round(eta)))
-                if td.tm_hour > 0:
-                    eta_str = time.strftime("%H:%M:%S remaining", td)
-                else:
-                    eta_str = time.strftime("%M:%S remaining", td)
-        status_lines.append(f"Speed: {speed_str} | ETA: {eta_str}")
-        self.status_callback("\n".join(status_lines))
-
-    def _format_playlist_progress_status(
-        self, status_lines: List[str], info_dict: Dict[str, Any]
-    ) -> None:
-        current_absolute_index: int = (
-            self.downloader._current_processing_playlist_idx_display
-        )
-        total_absolute_str: str = (
-            f"of {self.downloader.total_playlist_count} total"
-            if self.downloader.total_playlist_count > 0
-            else ""
+        # isinstance() already rules out the TypeError/ValueError cases.
+        if isinstance(eta, (int, float)) and 0 <= eta < _MAX_ETA_SECONDS:
+            td = time.gmtime(int(eta + 0.5))
+            if td.tm_hour > 0:
+                eta_str = time.strftime("%H:%M:%S remaining", td)
+            else:
+                eta_str = time.strftime("%M:%S remaining", td)
+        self.status_callback(
+            self._TPL_STATUS.format(
+                header=header,
+                pct=percentage_str_artifact,
+                done=downloaded_size_str,
+                total=total_size_str_artifact,
+                speed=speed_str,
+                eta=eta_str,
+            )
         )
+
+    def _playlist_header(self, info_dict: Dict[str, Any]) -> str:
+        """Returns the two playlist status lines (current item, selection progress)."""
+        dl = self.downloader
+        current_absolute_index: int = self._playlist_index or 1
+        total_absolute_str: str = dl._total_str
         item_title = info_dict.get("title")
         if not item_title and self._last_artifact_filename_hook:
-            item_title = Path(self._last_artifact_filename_hook).stem
+            item_title = os.path.splitext(
+                os.path.basename(self._last_artifact_filename_hook)
+            )[0]
+        item_line: str
         if item_title:
-            item_title_cleaned = clean_filename(item_title)
-            status_lines.append(
-                f"Item {current_absolute_index} {total_absolute_str}: {item_title_cleaned[:45]}..."
-            )
+            item_title_cleaned = dl._clean_name(item_title)
+            item_line = f"Item {current_absolute_index} {total_absolute_str}: {item_title_cleaned[:45]}..."
         else:
-            status_lines.append(f"Item {current_absolute_index} {total_absolute_str}")
-        index_in_selection: int = self.downloader._processed_selected_count + 1
-        index_in_selection = min(
-            index_in_selection, self.downloader.selected_items_count
-        )
-        remaining_in_selection: int = max(
-            0,
-            self.downloader.selected_items_count
-            - self.downloader._processed_selected_count,
-        )
-        status_lines.append(
-            f"Selected: {index_in_selection} of {self.downloader.selected_items_count} ({remaining_in_selection} remaining)"
-        )
+            item_line = f"Item {current_absolute_index} {total_absolute_str}"
+        # The selection line only changes when another item completes.
+        processed: int = dl._processed_selected_count
+        if processed != self._selection_line_count:
+            selected_total: int = dl.selected_items_count
+            self._selection_line = self._TPL_SELECTION.format(
+                sel_i=min(processed + 1, selected_total),
+                sel_n=selected_total,
+                rem=max(0, selected_total - processed),
+            )
+            self._selection_line_count = processed
+        return f"{item_line}\n{self._selection_line}"
 
 
 class PostprocessorHookHandler:
@@ -212,23 +304,29 @@ class PostprocessorHookHandler:
         self.downloader: "Downloader" = downloader
         # <<< إضافة: تتبع ما إذا تم النقل لهذا الملف بالفعل >>>
         self._moved_files_for_current_item: set = set()
+        # Source and destination paths already finalized; yt-dlp can fire several
+        # "finished" postprocessor hooks for the same file.
+        self._moved_paths: Set[str] = set()
+        # Move prepared when Merger/ExtractAudio finished; queued once MoveFiles
+        # (yt-dlp's last step for the item) is done with the file.
+        self._pending_move: Optional[functools.partial] = None
+        self._status_cb: Callable[[str], None] = downloader.status_callback
 
     def hook(self, d: Dict[str, Any]) -> None:
         """خطاف المعالج اللاحق لـ yt-dlp."""
-        status: Optional[str] = d.get("status")
-        postprocessor_name: Optional[str] = d.get("postprocessor")
-        info_dict: Dict[str, Any] = d.get("info_dict", {})
+        get = d.get
+        status: Optional[str] = get("status")
+        postprocessor_name: Optional[str] = get("postprocessor")
+        info_dict: Dict[str, Any] = get("info_dict") or {}
+        # Read once; used by both the reset logic and the "finished" branch.
+        current_playlist_index: Optional[int] = info_dict.get("playlist_index")
 
         # <<< إضافة: إعادة تعيين حالة النقل عند بدء عنصر قائمة تشغيل جديد >>>
         # نعتمد على تغيير فهرس قائمة التشغيل في ProgressHook لتحديد بداية عنصر جديد
         # هذا ليس دقيقًا 100% ولكنه أفضل ما يمكن
         if self.downloader.is_playlist:
-            current_display_index = (
-                self.downloader._current_processing_playlist_idx_display
-            )
             # إذا لم نسجل أي عملية نقل لهذا الفهرس بعد، قم بإعادة التعيين
             # هذا يحتاج طريقة أفضل، لنعتمد على playlist_index من info_dict هنا
-            current_playlist_index = info_dict.get("playlist_index")
             if (
                 current_playlist_index
                 and current_playlist_index not in self._moved_files_for_current_item
@@ -237,145 +335,217 @@ class PostprocessorHookHandler:
                 self._moved_files_for_current_item = set()  # Reset for new item
 
         if status == "started":
-            print(f"Postprocessor Hook: '{postprocessor_name}' started.")
+            log.debug("Postprocessor Hook: '%s' started.", postprocessor_name)
             # --- الكود الخاص بحالة started يبقى كما هو ---
-            status_message: str = STATUS_FINAL_PROCESSING
-            # Use short names for comparison here as well
-            if postprocessor_name == "Merger":
-                status_message = PP_STATUS_MERGING
-            elif postprocessor_name == "FFmpegExtractAudio":
-                target_codec: str = "audio"
-                pp_args: Any = info_dict.get("postprocessor_args")
-                with contextlib.suppress(Exception):
-                    if isinstance(pp_args, list) and len(pp_args) >= 2:
-                        target_codec = pp_args[1]
-                    elif isinstance(pp_args, dict):
-                        target_codec = pp_args.get("preferredcodec", target_codec)
-                status_message = (
-                    PP_STATUS_CONVERTING_MP3
-                    if target_codec == "mp3"
-                    else PP_STATUS_EXTRACTING_AUDIO.format(codec=target_codec)
-                )
-            elif postprocessor_name == "FFmpegVideoConvertor":
-                status_message = PP_STATUS_CONVERTING_VIDEO
-            # Remove MoveFiles from status updates shown to user
-            # elif postprocessor_name == "MoveFiles": status_message = STATUS_ORGANIZE_FILES
-            elif postprocessor_name:
-                status_message = PP_STATUS_PROCESSING_GENERIC_PP.format(
-                    pp_name=postprocessor_name
-                )
+            # Fixed messages are one dict lookup; the rest need the PP's details.
+            status_message: Optional[str] = _PP_STARTED_STATUS.get(postprocessor_name)
+            if status_message is None:
+                if postprocessor_name == "FFmpegExtractAudio":
+                    target_codec: str = "audio"
+                    pp_args: Any = info_dict.get("postprocessor_args")
+                    with contextlib.suppress(Exception):
+                        if isinstance(pp_args, list) and len(pp_args) >= 2:
+                            target_codec = pp_args[1]
+                        elif isinstance(pp_args, dict):
+                            target_codec = pp_args.get("preferredcodec", target_codec)
+                    status_message = (
+                        PP_STATUS_CONVERTING_MP3
+                        if target_codec == "mp3"
+                        else PP_STATUS_EXTRACTING_AUDIO.format(codec=target_codec)
+                    )
+                # Remove MoveFiles from status updates shown to user
+                # elif postprocessor_name == "MoveFiles": status_message = STATUS_ORGANIZE_FILES
+                elif postprocessor_name:
+                    status_message = PP_STATUS_PROCESSING_GENERIC_PP.format(
+                        pp_name=postprocessor_name
+                    )
+                else:
+                    status_message = STATUS_FINAL_PROCESSING
 
             # Only update status if it's not MoveFiles (internal)
             if postprocessor_name != "MoveFiles":
-                self.downloader.status_callback(status_message)
+                self._status_cb(status_message)
 
         elif status == "finished":
             temp_filepath_hook: Optional[str] = info_dict.get("filepath")
-            print(
-                f"Postprocessor Hook: Status='finished', PP='{postprocessor_name}', Hook Path='{temp_filepath_hook}'"
+            log.debug(
+                "Postprocessor Hook: Status='finished', PP='%s', Hook Path='%s'",
+                postprocessor_name,
+                temp_filepath_hook,
             )
 
+            if postprocessor_name == "MoveFiles":
+                self.queue_pending_move(temp_filepath_hook)
+                return
+
             # --- <<< تعديل الشرط الرئيسي للنقل >>> ---
             # تحقق من اسم المعالج ومن وجود مسار الملف
             # وأضف تحققًا للتأكد من أننا لم ننقل هذا الملف بالفعل
-            current_playlist_index = info_dict.get(
-                "playlist_index"
-            )  # Get index for tracking
 
             # We primarily care about Merger or FFmpegExtractAudio finishing
             trigger_move = postprocessor_name in ["Merger", "FFmpegExtractAudio"]
 
             # Check if already moved for this index (if playlist)
-            already_moved = False
-            if self.downloader.is_playlist and current_playlist_index and current_playlist_index in self._moved_files_for_current_item:
+            already_moved = temp_filepath_hook in self._moved_paths
+            if already_moved:
+                log.debug(
+                    "Postprocessor Hook: '%s' already finalized. Skipping.",
+                    temp_filepath_hook,
+                )
+            elif self.downloader.is_playlist and current_playlist_index and current_playlist_index in self._moved_files_for_current_item:
                 already_moved = True
-                print(
-                    f"Postprocessor Hook: Already moved file for index {current_playlist_index}. Skipping."
+                log.debug(
+                    "Postprocessor Hook: Already moved file for index %s. Skipping.",
+                    current_playlist_index,
                 )
 
             if trigger_move and temp_filepath_hook and not already_moved:
-                print(
-                    f"Postprocessor Hook: Trigger processor '{postprocessor_name}' finished for '{temp_filepath_hook}'. Initiating move/rename."
+                log.info(
+                    "Postprocessor Hook: Trigger processor '%s' finished for '%s'. Initiating move/rename.",
+                    postprocessor_name,
+                    temp_filepath_hook,
                 )
 
-                temp_source_path = Path(temp_filepath_hook)
-
-                if not temp_source_path.is_file():
-                    print(
-                        f"Postprocessor Error: Source file '{temp_source_path}' not found for move/rename."
-                    )
-                    return
+                # No pre-move stat: yt-dlp reports the file it just wrote, and a
+                # missing source is reported by _move_to_save_path (FileNotFoundError).
+                temp_source_path: str = temp_filepath_hook
 
                 # --- بناء اسم الملف النهائي المستهدف ---
+                current_basename: str = os.path.basename(temp_source_path)
                 target_basename = ""
-                final_save_dir = Path(self.downloader.save_path)
+                final_save_dir: str = self.downloader.save_path
                 if info_dict:
                     target_basename = self._extracted_from_hook_98(
-                        info_dict, temp_source_path, current_playlist_index
+                        info_dict, current_basename, current_playlist_index
                     )
                 else:
-                    print(
+                    log.warning(
                         "Postprocessor Warning: info_dict not found in hook. Using original temp filename."
                     )
-                    target_basename = temp_source_path.name
+                    target_basename = current_basename
 
                 # --- بناء المسار النهائي وتنفيذ النقل ---
-                final_dest_path = final_save_dir / target_basename
-                print(
-                    f"Postprocessor Hook: Moving '{temp_source_path}' -> '{final_dest_path}'"
+                final_dest_path: str = os.path.join(final_save_dir, target_basename)
+                # Mark now so repeated "finished" hooks don't queue the same file twice.
+                self._moved_paths.add(temp_source_path)
+                self._moved_paths.add(final_dest_path)
+                if self.downloader.is_playlist and current_playlist_index:
+                    # Store the index to prevent moving again if MoveFiles hook runs later
+                    self._moved_files_for_current_item.add(current_playlist_index)
+
+                # yt-dlp may still touch the file (later postprocessors,
+                # MoveFiles), so the move waits for MoveFiles; see queue_pending_move.
+                self.queue_pending_move()  # MoveFiles never came for the previous file
+                self._pending_move = functools.partial(
+                    self._move_to_save_path,
+                    temp_source_path,
+                    final_dest_path,
+                    {
+                        "title": info_dict.get("title"),
+                        "playlist_index": current_playlist_index,
+                    },
                 )
-                try:
-                    check_cancel(
-                        self.downloader.cancel_event, "before final move in hook"
-                    )
-                    time.sleep(0.1)
-                    final_save_dir.mkdir(parents=True, exist_ok=True)
-                    shutil.move(str(temp_source_path), str(final_dest_path))
-                    print(
-                        f"Postprocessor Hook: Move successful for '{target_basename}'."
-                    )
-
-                    # --- تم النجاح النهائي لهذا الملف ---
-                    self.downloader.status_callback(f"Completed: {target_basename}")
-                    self.downloader._update_status_on_finish_or_process(
-                        str(final_dest_path), info_dict, is_final=True
-                    )
-
-                    # <<< إضافة: تسجيل أن هذا الملف تم نقله >>>
-                    if self.downloader.is_playlist and current_playlist_index:
-                        # Store the index to prevent moving again if MoveFiles hook runs later
-                        self._moved_files_for_current_item.add(current_playlist_index)
-                        print(
-                            f"Postprocessor Hook: Marked index {current_playlist_index} as moved."
-                        )
-
-                except OSError as move_err:
-                    print(f"Postprocessor Error: Failed to move file: {move_err}")
-                    self.downloader.status_callback(f"Error moving file: {move_err}")
-                except DownloadCancelled:
-                    print("Postprocessor Hook: Cancellation requested during move.")
-                except Exception as final_err:
-                    print(
-                        f"Postprocessor Error: Unexpected error during move/rename: {final_err}"
-                    )
-                    self.downloader.status_callback(
-                        f"Unexpected error finalizing file: {final_err}"
-                    )
             else:
                 # تجاهل معالجات أخرى أو ملفات تم نقلها بالفعل
                 if not trigger_move:
-                    print(
-                        f"Postprocessor Hook: Ignoring 'finished' status for '{postprocessor_name}' (Not a trigger)."
+                    log.debug(
+                        "Postprocessor Hook: Ignoring 'finished' status for '%s' (Not a trigger).",
+                        postprocessor_name,
                     )
                 elif not already_moved:
-                    print(
-                        f"Postprocessor Warning: No filepath found in 'finished' hook for '{postprocessor_name}'."
+                    log.warning(
+                        "Postprocessor Warning: No filepath found in 'finished' hook for '%s'.",
+                        postprocessor_name,
                     )
 
+    def queue_pending_move(self, moved_filepath: Optional[str] = None) -> None:
+        """
+        Hands the pending move to the downloader's finalizer thread, so yt-dlp
+        continues with the next item while the file is being moved.
+        moved_filepath: where MoveFiles left the file, if it reported one.
+        """
+        job = self._pending_move
+        if job is None:
+            return
+        self._pending_move = None
+        if moved_filepath and moved_filepath != job.args[0]:
+            self._moved_paths.add(moved_filepath)
+            job = functools.partial(job.func, moved_filepath, *job.args[1:])
+        self.downloader._enqueue_finalize(job)
+
+    def _move_to_save_path(
+        self, temp_source_path: str, final_dest_path: str, item_info: Dict[str, Any]
+    ) -> None:
+        """Moves a finished file from the temp folder to the save path and reports it."""
+        target_basename: str = os.path.basename(final_dest_path)
+        log.info(
+            "Postprocessor Hook: Moving '%s' -> '%s'",
+            temp_source_path,
+            final_dest_path,
+        )
+        try:
+            check_cancel(self.downloader.cancel_event, "before final move in hook")
+            if _is_same_path(temp_source_path, final_dest_path):
+                # No temp folder in use and yt-dlp already wrote the target name.
+                log.debug(
+                    "Postprocessor Hook: '%s' already in place. Skipping move.",
+                    target_basename,
+                )
+            else:
+                os.makedirs(self.downloader.save_path, exist_ok=True)
+                self._replace_or_move(temp_source_path, final_dest_path)
+                log.info(
+                    "Postprocessor Hook: Move successful for '%s'.",
+                    target_basename,
+                )
+
+            # --- تم النجاح النهائي لهذا الملف ---
+            self._status_cb(f"Completed: {target_basename}")
+            self.downloader._update_status_on_finish_or_process(
+                final_dest_path, item_info, is_final=True
+            )
+        except FileNotFoundError:
+            log.error(
+                "Postprocessor Error: Source file '%s' not found for move/rename.",
+                temp_source_path,
+            )
+            self._status_cb(f"Error moving file: '{target_basename}' not found")
+        except OSError as move_err:
+            log.error("Postprocessor Error: Failed to move file: %s", move_err)
+            self._status_cb(f"Error moving file: {move_err}")
+        except DownloadCancelled:
+            log.info("Postprocessor Hook: Cancellation requested during move.")
+        except Exception as final_err:
+            log.error(
+                "Postprocessor Error: Unexpected error during move/rename: %s",
+                final_err,
+            )
+            self._status_cb(f"Unexpected error finalizing file: {final_err}")
+
+    @staticmethod
+    def _replace_or_move(source: str, dest: str) -> None:
+        """Atomic rename when possible, copy + delete across drives; retries locked files on Windows."""
+        for attempt in range(1, _MOVE_ATTEMPTS + 1):
+            try:
+                # Same filesystem: a single atomic rename.
+                os.replace(source, dest)
+                return
+            except PermissionError:
+                if not _RETRY_LOCKED_MOVES or attempt == _MOVE_ATTEMPTS:
+                    raise
+                log.debug("Postprocessor Hook: '%s' is locked, retrying move.", source)
+                time.sleep(_MOVE_RETRY_DELAY * attempt)
+            except OSError as replace_err:
+                if replace_err.errno != errno.EXDEV:
+                    raise
+                # Temp dir and save path are on different drives: copy + delete.
+                shutil.move(source, dest)
+                return
+
     # TODO Rename this here and in `hook`
-    def _extracted_from_hook_98(self, info_dict, temp_source_path, current_playlist_index):
+    def _extracted_from_hook_98(self, info_dict, current_basename, current_playlist_index):
         base_title: str = info_dict.get("title", "Untitled")
-        base_ext: str = temp_source_path.suffix
+        base_ext: str = os.path.splitext(current_basename)[1]
         # Use playlist_index obtained earlier for consistency
         target_basename_no_ext: str
         target_basename_no_ext = (
@@ -383,7 +553,10 @@ class PostprocessorHookHandler:
             if (self.downloader.is_playlist and current_playlist_index is not None)
             else base_title
         )
-        cleaned_target_basename_no_ext: str = clean_filename(
-            target_basename_no_ext
+        cleaned_target_basename_no_ext: str = (
+            self.downloader._clean_name(target_basename_no_ext)
+            if not target_basename_no_ext
+            or _NEEDS_CLEANING_RE.search(target_basename_no_ext)
+            else target_basename_no_ext
         )
         return f"{cleaned_target_basename_no_ext}{base_ext}"
@@ -2,12 +2,24 @@
 # -- ملف يحتوي على كلاس جلب المعلومات --
 # -- Modified to ensure thumbnail URLs are part of the fetched info --
 
+import copy
+import hashlib
+import itertools
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
 import yt_dlp
-import traceback
 import threading
-from typing import Callable, Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, List, Tuple
+from yt_dlp.utils import DownloadCancelled as YtdlpDownloadCancelled
 
 from .exceptions import DownloadCancelled
+from . import ydl_pool
+from .downloader_constants import APP_CACHE_DIR, YTDLP_CACHE_DIR
 
 STATUS_FETCHING = "Fetching information..."
 STATUS_FETCHED_SUCCESS = "Information fetched successfully."
@@ -19,6 +31,156 @@ ERROR_INVALID_URL = (
 )
 ERROR_UNEXPECTED_FETCH = "An unexpected error occurred during info fetch"
 
+log = logging.getLogger(__name__)
+
+PLAYLIST_END: int = 500
+INFO_CACHE_TTL: int = 24 * 60 * 60  # seconds a fetched result is reused
+INFO_CACHE_DIR: str = os.path.join(APP_CACHE_DIR, "info")
+INFO_CACHE_DB: str = os.path.join(INFO_CACHE_DIR, "info_cache.sqlite3")
+# Set on results served from the metadata cache; such listings may be up to
+# INFO_CACHE_TTL old, so the UI does not hand them to downloads as prefetched info.
+INFO_FROM_CACHE_KEY: str = "_asf_from_cache"
+
+# YouTube playlist/channel listing URLs; these take the unprocessed fast path.
+_YOUTUBE_TAB_RE = re.compile(
+    r"^https?://(?:www\.|m\.|music\.)?youtube\.com/"
+    r"(?:playlist\?(?:.*&)?list=|(?:channel/[^/?#]+|c/[^/?#]+|user/[^/?#]+|@[^/?#]+)(?:/(?:videos|shorts|streams|playlists))?/?(?:[?#]|$))"
+)
+
+# Constant for every fetch, so the pool keeps a single warm YoutubeDL for it.
+_FETCH_OPTS: Dict[str, Any] = {
+    "quiet": True,
+    "nocheckcertificate": True,
+    "extract_flat": "in_playlist",
+    "playlistend": PLAYLIST_END,
+    "ignoreerrors": True,
+    "skip_download": True,
+    "cachedir": YTDLP_CACHE_DIR,
+    # Ensure thumbnails are not skipped by default yt-dlp behavior for flat extract.
+    # However, 'thumbnail' key is usually present even with extract_flat for the main playlist/video.
+    # For individual playlist entries, more detailed fetching might be needed if flat extract is too aggressive.
+    # 'writethumbnail': True, # This would download them, not what we want.
+    # We just need the URL.
+}
+
+# Speculative per-entry extraction (process=False) for the first playlist items
+# while the user is still reviewing the list; Downloader picks these up by id.
+# The results carry signed format URLs that expire, so they are only reused
+# for ENTRY_PREFETCH_TTL seconds; older entries are re-extracted at download time.
+ENTRY_PREFETCH_LIMIT: int = 20
+ENTRY_PREFETCH_TTL: float = 10 * 60
+ENTRY_BATCH_SIZE: int = 20  # entries per entries_callback() while listing
+_ENTRY_OPTS: Dict[str, Any] = {
+    "quiet": True,
+    "nocheckcertificate": True,
+    "skip_download": True,
+    "cachedir": YTDLP_CACHE_DIR,
+}
+_entry_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="entry-prefetch")
+# video id -> (time.monotonic() when fetched, unprocessed info)
+_prefetched_entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_prefetched_entries_lock = threading.Lock()
+
+
+def _drop_expired_entries(now: float) -> None:
+    """Removes prefetched entries past ENTRY_PREFETCH_TTL; caller holds the lock."""
+    expired = [
+        vid
+        for vid, (fetched_at, _) in _prefetched_entries.items()
+        if now - fetched_at >= ENTRY_PREFETCH_TTL
+    ]
+    for vid in expired:
+        del _prefetched_entries[vid]
+
+
+def get_prefetched_entry(video_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    A private copy of the prefetched (unprocessed) info for video_id, or None if
+    there is none or it is older than ENTRY_PREFETCH_TTL (its URLs may have expired).
+    """
+    if not video_id:
+        return None
+    with _prefetched_entries_lock:
+        _drop_expired_entries(time.monotonic())
+        hit = _prefetched_entries.get(video_id)
+    return copy.deepcopy(hit[1]) if hit is not None else None
+
+
+class _MetaCache:
+    """
+    Small SQLite key/value store for fetch results (JSON, with expiry); stdlib
+    only, so it works in every install and in the frozen builds.
+    """
+
+    def __init__(self, db_path: str):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Shared by the fetch threads; every access goes through self._lock.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta "
+                "(key TEXT PRIMARY KEY, expires REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM meta WHERE expires <= ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires, value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[0] <= time.time():
+            return None
+        return json.loads(row[1])
+
+    def set(self, key: str, value: Any, expire: float) -> None:
+        data = json.dumps(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, expires, value) VALUES (?, ?, ?)",
+                (key, time.time() + expire, data),
+            )
+
+
+_meta_cache: Optional[_MetaCache] = None
+_meta_cache_failed: bool = False
+_meta_cache_lock = threading.Lock()
+
+
+def _get_meta_cache() -> Optional[_MetaCache]:
+    """Opens the metadata cache on first use; None if it cannot be opened."""
+    global _meta_cache, _meta_cache_failed
+    with _meta_cache_lock:
+        if _meta_cache is None and not _meta_cache_failed:
+            try:
+                _meta_cache = _MetaCache(INFO_CACHE_DB)
+            except (sqlite3.Error, OSError) as e:
+                _meta_cache_failed = True  # don't retry (and warn) on every fetch
+                log.warning("InfoFetcher: Metadata cache disabled: %s", e)
+        return _meta_cache
+
+
+def shutdown_prefetch() -> None:
+    """Drops queued entry prefetches; called on application exit."""
+    _entry_prefetch_pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Ensure 'thumbnail' key or 'thumbnails' list exists and select one.
+# yt-dlp usually provides 'thumbnail' (single URL) or 'thumbnails' (list of dicts).
+def _best_thumbnail_url(item_info: Dict[str, Any]) -> Optional[str]:
+    if not item_info:
+        return None
+    if "thumbnail" in item_info and isinstance(item_info["thumbnail"], str):
+        return item_info["thumbnail"]
+    if "thumbnails" in item_info and isinstance(item_info["thumbnails"], list):
+        # Prefer higher resolution if multiple thumbnails are available
+        # For simplicity, take the last one, often the largest.
+        # Or iterate and find one with specific width/height if needed.
+        for thumb_info in reversed(item_info["thumbnails"]):
+            if isinstance(thumb_info, dict) and "url" in thumb_info:
+                return thumb_info["url"]
+    return None
+
 
 class InfoFetcher:
     """
@@ -35,6 +197,8 @@ class InfoFetcher:
         status_callback: Callable[[str], None],
         progress_callback: Callable[[float], None],
         finished_callback: Callable[[], None],
+        entries_callback: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        use_cache: bool = True,
     ):
         self.url: str = url
         self.cancel_event: threading.Event = cancel_event
@@ -43,38 +207,61 @@ class InfoFetcher:
         self.status_callback: Callable[[str], None] = status_callback
         self.progress_callback: Callable[[float], None] = progress_callback
         self.finished_callback: Callable[[], None] = finished_callback
+        # Receives playlist entries in batches while they are still being listed;
+        # success_callback still gets the complete result at the end.
+        self.entries_callback: Optional[Callable[[List[Dict[str, Any]]], None]] = (
+            entries_callback
+        )
+        # False forces a fresh extraction (refresh); the result is still cached.
+        self.use_cache: bool = use_cache
 
     def _check_cancel(self, stage: str = "") -> None:
         if self.cancel_event.is_set():
             raise DownloadCancelled(f"{STATUS_FETCH_CANCELLED} {stage}.")
 
+    def _cancel_filter(self, info: Dict[str, Any], *, incomplete: bool = False) -> None:
+        """
+        yt-dlp match_filter, called for every playlist entry during extraction;
+        lets a cancel interrupt extract_info itself instead of waiting for it.
+        """
+        if self.cancel_event.is_set():
+            raise YtdlpDownloadCancelled("during extract_info")
+        return None
+
     def _fetch_info_core(self) -> None:
         self.status_callback(STATUS_FETCHING)
         self.progress_callback(0.0)
-        self._check_cancel("before starting fetch")
-
-        ydl_opts: Dict[str, Any] = {
-            "quiet": True,
-            "nocheckcertificate": True,
-            "extract_flat": "in_playlist",
-            "playlistend": 500,
-            "ignoreerrors": True,
-            "forcejson": True,
-            "skip_download": True,
-            # Ensure thumbnails are not skipped by default yt-dlp behavior for flat extract.
-            # However, 'thumbnail' key is usually present even with extract_flat for the main playlist/video.
-            # For individual playlist entries, more detailed fetching might be needed if flat extract is too aggressive.
-            # 'writethumbnail': True, # This would download them, not what we want.
-            # We just need the URL.
-        }
+
+        cache = _get_meta_cache()
+        cache_key: str = hashlib.sha1(f"{self.url}|{PLAYLIST_END}".encode()).hexdigest()
+        if cache is not None and self.use_cache:
+            info: Optional[Dict[str, Any]] = cache.get(cache_key)
+            if info:
+                self._check_cancel("before using cached information")
+                log.info("InfoFetcher: Using cached information for %s", self.url)
+                self.status_callback(STATUS_FETCHED_SUCCESS)
+                self.progress_callback(1.0)
+                info[INFO_FROM_CACHE_KEY] = True
+                # No entry prefetch here: downloads of cached listings re-extract
+                # the playlist and never read the prefetch pool.
+                self.success_callback(info)
+                return
 
         info_dict: Optional[Dict[str, Any]] = None
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with ydl_pool.lease(
+                {**_FETCH_OPTS, "match_filter": self._cancel_filter},
+                per_call=("match_filter",),
+            ) as ydl:
                 self._check_cancel("before calling extract_info")
-                info_dict = ydl.extract_info(self.url, download=False)
+                if _YOUTUBE_TAB_RE.match(self.url):
+                    info_dict = self._extract_youtube_tab(ydl)
+                if info_dict is None:
+                    info_dict = ydl.extract_info(self.url, download=False)
                 self._check_cancel("after calling extract_info")
 
+        except YtdlpDownloadCancelled as e:
+            raise DownloadCancelled(f"{STATUS_FETCH_CANCELLED} {e}.") from e
         except yt_dlp.utils.DownloadError as e:
             error_message: str = str(e)
             partial_info: Optional[Dict[str, Any]] = None
@@ -83,12 +270,12 @@ class InfoFetcher:
             if getattr(e, "partial", False):
                 partial_info = getattr(e, "data", None)
             if partial_info:
-                print(f"InfoFetcher yt-dlp DownloadError with partial data: {e}")
+                log.warning("InfoFetcher yt-dlp DownloadError with partial data: %s", e)
                 self._process_and_callback_info(
                     partial_info
                 )  # Process even partial info
             else:
-                print(f"InfoFetcher yt-dlp DownloadError: {e}")
+                log.error("InfoFetcher yt-dlp DownloadError: %s", e)
                 self.error_callback(f"{ERROR_FETCH_PREFIX}: {error_message}")
             return
 
@@ -99,50 +286,77 @@ class InfoFetcher:
             self.error_callback(f"{ERROR_UNEXPECTED_FETCH}: {type(e).__name__}")
             return
 
-        self._process_and_callback_info(info_dict)
+        self._process_and_callback_info(
+            info_dict, cache_key if cache is not None else None
+        )
 
-    def _process_and_callback_info(self, info_dict: Optional[Dict[str, Any]]) -> None:
+    def _extract_youtube_tab(self, ydl: yt_dlp.YoutubeDL) -> Optional[Dict[str, Any]]:
+        """
+        Lists a YouTube playlist/channel without yt-dlp's result processing: the
+        tab extractor already yields flat {id, title, url, ...} entries, so only
+        the first PLAYLIST_END are taken. Returns None to fall back to the
+        regular extract_info path if anything goes wrong.
+        """
+        try:
+            info = ydl.extract_info(self.url, download=False, process=False)
+            if not info or info.get("_type") not in ("playlist", "multi_video"):
+                return None
+            entries: List[Any] = []
+            batch: List[Dict[str, Any]] = []
+            for entry in itertools.islice(info.get("entries") or (), PLAYLIST_END):
+                self._check_cancel("while listing playlist entries")
+                if not isinstance(entry, dict):
+                    continue  # same compaction _process_and_callback_info applies
+                entry["thumbnail_url"] = _best_thumbnail_url(entry)
+                entries.append(entry)
+                if self.entries_callback:
+                    batch.append(entry)
+                    if len(batch) >= ENTRY_BATCH_SIZE:
+                        self.entries_callback(batch)
+                        batch = []
+            if batch:
+                self.entries_callback(batch)
+        except DownloadCancelled:
+            raise
+        except Exception as e:
+            log.info("InfoFetcher: Fast playlist listing failed, using full extraction: %s", e)
+            return None
+        info["entries"] = entries
+        info.setdefault("original_url", self.url)
+        return info
+
+    def _process_and_callback_info(
+        self, info_dict: Optional[Dict[str, Any]], cache_key: Optional[str] = None
+    ) -> None:
         """
         Processes the fetched info_dict (handles playlists, extracts thumbnails)
         and calls the appropriate success or error callback.
         """
         if not info_dict:
-            print("InfoFetcher: No information dictionary returned.")
+            log.error("InfoFetcher: No information dictionary returned.")
             self.error_callback(ERROR_INVALID_URL)
             return
 
-        # Ensure 'thumbnail' key or 'thumbnails' list exists and select one.
-        # yt-dlp usually provides 'thumbnail' (single URL) or 'thumbnails' (list of dicts).
-        def get_best_thumbnail_url(item_info: Dict[str, Any]) -> Optional[str]:
-            if not item_info:
-                return None
-            if "thumbnail" in item_info and isinstance(item_info["thumbnail"], str):
-                return item_info["thumbnail"]
-            if "thumbnails" in item_info and isinstance(item_info["thumbnails"], list):
-                # Prefer higher resolution if multiple thumbnails are available
-                # For simplicity, take the last one, often the largest.
-                # Or iterate and find one with specific width/height if needed.
-                for thumb_info in reversed(item_info["thumbnails"]):
-                    if isinstance(thumb_info, dict) and "url" in thumb_info:
-                        return thumb_info["url"]
-            return None
-
         # Add/update thumbnail_url for the main item
-        info_dict["thumbnail_url"] = get_best_thumbnail_url(info_dict)
+        info_dict["thumbnail_url"] = _best_thumbnail_url(info_dict)
 
-        if "entries" in info_dict and isinstance(info_dict["entries"], list):
-            valid_entries: List[Dict[str, Any]] = []
-            for entry in info_dict["entries"]:
+        entries = info_dict.get("entries")
+        if isinstance(entries, list):
+            # Compact in place (drop unavailable/None entries) instead of building
+            # a second list of the same size.
+            valid_count: int = 0
+            for entry in entries:
                 if isinstance(entry, dict):
                     # Add/update thumbnail_url for each entry in the playlist
-                    entry["thumbnail_url"] = get_best_thumbnail_url(entry)
-                    valid_entries.append(entry)
+                    entry["thumbnail_url"] = _best_thumbnail_url(entry)
+                    entries[valid_count] = entry
+                    valid_count += 1
+            del entries[valid_count:]
 
-            if not valid_entries and info_dict.get("extractor_key") == "YoutubeTab":
-                print("InfoFetcher: YouTube playlist seems empty or private.")
+            if not valid_count and info_dict.get("extractor_key") == "YoutubeTab":
+                log.warning("InfoFetcher: YouTube playlist seems empty or private.")
                 self.error_callback(ERROR_EMPTY_PLAYLIST)
                 return
-            info_dict["entries"] = valid_entries
 
         # Debug: print extracted thumbnail URLs
         # print(f"Main thumbnail URL: {info_dict.get('thumbnail_url')}")
@@ -150,24 +364,57 @@ class InfoFetcher:
         #     for i, entry in enumerate(info_dict["entries"]):
         #         print(f"Entry {i} thumbnail URL: {entry.get('thumbnail_url')}")
 
+        if cache_key is not None:
+            try:
+                _get_meta_cache().set(cache_key, info_dict, expire=INFO_CACHE_TTL)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                log.warning("InfoFetcher: Could not cache fetched information: %s", e)
+
         self.status_callback(STATUS_FETCHED_SUCCESS)
         self.progress_callback(1.0)
         self.success_callback(info_dict)
+        self._prefetch_entries(info_dict.get("entries"))
+
+    def _prefetch_entries(self, entries: Any) -> None:
+        """Starts resolving the first playlist entries in the background."""
+        if not isinstance(entries, list) or not entries:
+            return
+        # Entries of earlier fetches stay usable by queued tasks until they expire;
+        # those still fresh are not extracted again.
+        with _prefetched_entries_lock:
+            _drop_expired_entries(time.monotonic())
+            fresh_ids = set(_prefetched_entries)
+        for entry in entries[:ENTRY_PREFETCH_LIMIT]:
+            url = entry.get("url") or entry.get("webpage_url")
+            if url and entry.get("id") and entry["id"] not in fresh_ids:
+                _entry_prefetch_pool.submit(self._prefetch_entry, entry["id"], url)
+
+    def _prefetch_entry(self, video_id: str, url: str) -> None:
+        if self.cancel_event.is_set():
+            return
+        try:
+            with ydl_pool.lease(_ENTRY_OPTS) as ydl:
+                info = ydl.extract_info(url, download=False, process=False)
+        except Exception as e:
+            log.debug("InfoFetcher: Prefetch of %s failed: %s", video_id, e)
+            return
+        if info and not self.cancel_event.is_set():
+            with _prefetched_entries_lock:
+                _prefetched_entries[video_id] = (time.monotonic(), info)
 
     def run(self) -> None:
         try:
             self._fetch_info_core()
         except DownloadCancelled as e:
             self.status_callback(str(e) or STATUS_FETCH_CANCELLED)
-            print(f"InfoFetcher Run: Caught {e}")
+            log.info("InfoFetcher Run: Caught %s", e)
         except Exception as e:
             self._log_unexpected_error(e, "in main run loop")
             self.error_callback(f"{ERROR_UNEXPECTED_FETCH}: {type(e).__name__}")
         finally:
-            print("InfoFetcher: Reached finally block, calling finished_callback.")
+            log.debug("InfoFetcher: Reached finally block, calling finished_callback.")
             self.finished_callback()
 
     def _log_unexpected_error(self, e: Exception, context: str) -> None:
-        print(f"--- UNEXPECTED ERROR ({context}) ---")
-        traceback.print_exc()
-        print("------------------------------------")
+        # The traceback is formatted only if a handler accepts the record.
+        log.exception("InfoFetcher: Unexpected error (%s): %s", context, e)
@@ -2,15 +2,17 @@
 # -- كلاس لجلب روابط التحميل المباشرة لقائمة تشغيل --
 # Purpose: Class to fetch direct download links for a playlist using yt-dlp subprocess.
 
+import logging
 import subprocess
 import threading
-import traceback
 from typing import Callable, List, Optional, Dict, Any
 
 # --- Imports from current package (using relative imports) ---
 from .exceptions import DownloadCancelled
 from .downloader_utils import build_format_string, check_cancel, log_unexpected_error
 
+log = logging.getLogger(__name__)
+
 
 class LinkFetcher:
     """
@@ -49,8 +51,8 @@ class LinkFetcher:
         self.error_callback: Callable[[str], None] = error_callback
         self.status_callback: Callable[[str], None] = status_callback
         self.finished_callback: Callable[[], None] = finished_callback
-        print(
-            f"LinkFetcher initialized for URL: {playlist_url}, Format: {format_choice}"
+        log.debug(
+            "LinkFetcher initialized for URL: %s, Format: %s", playlist_url, format_choice
         )
 
     def _get_links_core(self) -> None:
@@ -71,7 +73,7 @@ class LinkFetcher:
             return
 
         self.status_callback(f"Fetching links (Format: {self.format_choice})...")
-        print(f"LinkFetcher: Using format selector: {format_selector}")
+        log.debug("LinkFetcher: Using format selector: %s", format_selector)
 
         command: List[str] = [
             "yt-dlp",
@@ -87,9 +89,10 @@ class LinkFetcher:
         # إضافة مسار FFmpeg إذا كان متاحاً (قد تحتاجه yt-dlp حتى لجلب الروابط أحياناً)
         if self.ffmpeg_path:
             command.extend(["--ffmpeg-location", self.ffmpeg_path])
-            print(f"LinkFetcher: Providing ffmpeg path: {self.ffmpeg_path}")
+            log.debug("LinkFetcher: Providing ffmpeg path: %s", self.ffmpeg_path)
 
-        print(f"LinkFetcher: Running command: {' '.join(command)}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("LinkFetcher: Running command: %s", " ".join(command))
 
         try:
             # التحقق من الإلغاء قبل بدء العملية الفرعية
@@ -136,7 +139,7 @@ class LinkFetcher:
                     "yt-dlp did not return any valid links after filtering."
                 )
 
-            print(f"LinkFetcher: Successfully fetched {len(links_list)} links.")
+            log.info("LinkFetcher: Successfully fetched %d links.", len(links_list))
             self.success_callback(links_list)  # استدعاء كولباك النجاح مع قائمة الروابط
 
         except subprocess.CalledProcessError as e:
@@ -146,14 +149,14 @@ class LinkFetcher:
             clean_error = error_output
             if "ERROR:" in error_output:
                 clean_error = error_output.split("ERROR:", 1)[-1].strip()
-            print(
-                f"LinkFetcher Error (CalledProcessError): {e}\nStderr:\n{error_output}"
+            log.error(
+                "LinkFetcher Error (CalledProcessError): %s\nStderr:\n%s", e, error_output
             )
             self.error_callback(f"yt-dlp Error: {clean_error}")
 
         except FileNotFoundError:
             # لم يتم العثور على الملف التنفيذي لـ yt-dlp
-            print(
+            log.error(
                 "LinkFetcher Error: 'yt-dlp' command not found. Is it installed and in PATH?"
             )
             self.error_callback(
@@ -183,15 +186,17 @@ class LinkFetcher:
             # إذا تم طلب الإلغاء
             cancel_msg = str(e) or "Link fetching cancelled."
             self.status_callback(cancel_msg)
-            print(f"LinkFetcher Run: Caught DownloadCancelled: {e}")
+            log.info("LinkFetcher Run: Caught DownloadCancelled: %s", e)
         except Exception as e:
             # التقاط أي أخطاء غير متوقعة لم يتم التعامل معها في _get_links_core
             # يتم استدعاء error_callback بالفعل بواسطة log_unexpected_error
-            print(
-                f"LinkFetcher Run: Caught unexpected exception in run: {type(e).__name__}: {e}"
+            log.error(
+                "LinkFetcher Run: Caught unexpected exception in run: %s: %s",
+                type(e).__name__,
+                e,
             )
             # لا نرفع الخطأ مرة أخرى هنا، فقط نضمن استدعاء finished_callback
         finally:
             # هذا البلوك يتم تنفيذه دائمًا
-            print("LinkFetcher: Reached finally block, calling finished_callback.")
+            log.debug("LinkFetcher: Reached finally block, calling finished_callback.")
             self.finished_callback()
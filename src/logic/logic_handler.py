@@ -2,18 +2,20 @@
 # -- ملف يحتوي على الكلاس المنسق لعمليات المنطق --
 # -- Fixed import, using STATUS_COMPLETED from downloader_constants --
 
+import concurrent.futures
+import logging
 import threading
 import time
-import traceback
 import uuid
 from collections import deque
-from typing import Callable, Dict, Any, Optional, Union
+from typing import Callable, Dict, Any, List, Optional, Set
 
 # --- Imports from current package (using relative imports) ---
-from .info_fetcher import InfoFetcher
+from .info_fetcher import InfoFetcher, shutdown_prefetch
 from .downloader import Downloader
 from .utils import find_ffmpeg
 from .exceptions import DownloadCancelled
+from . import ydl_pool
 # --- Import QueueTab statuses for internal logic ---
 from ..ui.queue_tab import (
     STATUS_PENDING,
@@ -33,9 +35,14 @@ from .downloader_constants import (
     STATUS_ERROR_PREFIX,
     STATUS_COMPLETED, # <<< استيراد مباشر الآن
     STATUS_DOWNLOAD_CANCELLED,
+    DEFAULT_CONCURRENT_FRAGMENTS,
+    DEFAULT_MAX_CONCURRENT_TASKS,
+    MAX_CONCURRENT_TASKS_LIMIT,
     # Add other constants if needed, e.g., STATUS_PROCESSING_PREFIX
 )
 
+log = logging.getLogger(__name__)
+
 
 # --- Constants ---
 ERROR_OPERATION_IN_PROGRESS = "Error: Fetch Info is already in progress."
@@ -54,10 +61,21 @@ LOG_CANCEL_RUNNING = "LogicHandler: Signalling running task to cancel: {task_id}
 LOG_NO_TASK_TO_CANCEL = "LogicHandler: Task {task_id} not found or already finished."
 
 
+def shutdown_shared_resources() -> None:
+    """
+    Stops the process-wide fetch/prefetch executors and closes every pooled
+    YoutubeDL. Call once on application exit, after LogicHandler.shutdown();
+    no fetch or download can start afterwards.
+    """
+    shutdown_prefetch()
+    ydl_pool.shutdown()
+
+
 class LogicHandler:
     """
     Coordinates between the GUI and background operations (info fetching and download queue).
-    Manages a sequential download queue, threads, and task-specific cancellation requests.
+    Manages the download queue (sequential by default, or up to max_concurrent_tasks
+    tasks at once), threads, and task-specific cancellation requests.
     """
 
     def __init__(
@@ -68,6 +86,11 @@ class LogicHandler:
         info_success_callback: Callable[[Dict[str, Any]], None],
         info_error_callback: Callable[[str], None],
         queue_callbacks: Dict[str, Callable],
+        max_parallel_videos: int = 1,
+        concurrent_fragments: int = DEFAULT_CONCURRENT_FRAGMENTS,
+        use_aria2: bool = False,
+        info_entries_callback: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        max_concurrent_tasks: int = DEFAULT_MAX_CONCURRENT_TASKS,
     ):
         """Initializes the logic handler with queue management."""
         self.status_callback_main = status_callback_main
@@ -75,6 +98,7 @@ class LogicHandler:
         self.finished_callback_main = finished_callback_main
         self.info_success_callback = info_success_callback
         self.info_error_callback = info_error_callback
+        self.info_entries_callback = info_entries_callback
 
         # --- Queue UI Callbacks ---
         self.queue_add_task_callback = queue_callbacks.get('add')
@@ -84,14 +108,29 @@ class LogicHandler:
 
         # --- FFmpeg ---
         self.ffmpeg_path: Optional[str] = find_ffmpeg()
-        if not self.ffmpeg_path: print(WARNING_FFMPEG_NOT_FOUND)
+        if not self.ffmpeg_path: log.warning(WARNING_FFMPEG_NOT_FOUND)
+
+        # --- Download Tuning ---
+        self.max_parallel_videos: int = max_parallel_videos
+        self.concurrent_fragments: int = concurrent_fragments
+        self.use_aria2: bool = use_aria2
 
         # --- Queue Management ---
         self.tasks_info: Dict[str, Dict[str, Any]] = {}
         self.pending_tasks: deque[str] = deque()
-        self.running_task_id: Optional[str] = None
+        self.running_task_ids: Set[str] = set()
         self.queue_lock = threading.Lock()
         self._stop_worker_event = threading.Event()
+        # Tasks run on this pool; the worker thread only dispatches them.
+        self.max_concurrent_tasks: int = min(
+            max(1, max_concurrent_tasks), MAX_CONCURRENT_TASKS_LIMIT
+        )
+        self._task_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrent_tasks, thread_name_prefix="DownloadTask"
+        )
+        self._task_futures: Set[concurrent.futures.Future] = set()
+        # Set by shutdown() under queue_lock; no task is submitted after that.
+        self._closing: bool = False
 
         # --- Active Operation Tracking ---
         self.fetch_info_cancel_event = threading.Event()
@@ -103,78 +142,104 @@ class LogicHandler:
 
     # --- Worker Thread Logic ---
     def _worker_loop(self) -> None:
-        """The main loop for the sequential download worker thread."""
-        print(LOG_WORKER_START)
+        """Dispatches pending tasks to the task pool while it has free slots."""
+        log.info(LOG_WORKER_START)
         while not self._stop_worker_event.is_set():
             next_task_id: Optional[str] = None
             task_details: Optional[Dict[str, Any]] = None
 
             with self.queue_lock:
-                if not self.running_task_id and self.pending_tasks:
+                if (
+                    not self._closing
+                    and len(self.running_task_ids) < self.max_concurrent_tasks
+                    and self.pending_tasks
+                ):
                     next_task_id = self.pending_tasks.popleft()
-                    self.running_task_id = next_task_id
+                    self.running_task_ids.add(next_task_id)
                     task_details = self.tasks_info.get(next_task_id)
                     if task_details:
                         task_details['status'] = STATUS_RUNNING
                         if self.queue_update_task_display_callback:
                              self.queue_update_task_display_callback(next_task_id, STATUS_RUNNING)
+                    else:
+                        self.running_task_ids.discard(next_task_id)
 
             if next_task_id and task_details:
-                print(LOG_WORKER_NEXT_TASK.format(task_id=next_task_id))
-                downloader_instance = None
-                # <<< استخدام STATUS_COMPLETED المستورد من downloader_constants >>>
-                task_final_status: str = STATUS_ERROR # Default to error
-                error_msg: str = "Unknown error during execution"
-
-                try:
-                    task_cancel_event = task_details.get('cancel_event')
-                    if not isinstance(task_cancel_event, threading.Event):
-                         raise ValueError("Invalid cancel_event found for task.")
-
-                    downloader_instance = Downloader(
-                        task_id=next_task_id, url=task_details['url'], save_path=task_details['save_path'],
-                        format_choice=task_details['format_choice'], is_playlist=task_details['is_playlist'],
-                        playlist_items=task_details['playlist_items'], selected_items_count=task_details['selected_count'],
-                        total_playlist_count=task_details['total_count'], ffmpeg_path=self.ffmpeg_path,
-                        cancel_event=task_cancel_event, status_callback=self._get_task_status_updater(next_task_id),
-                        progress_callback=self._get_task_progress_updater(next_task_id), finished_callback=lambda: None,
-                    )
-                    downloader_instance.run()
-
-                    if task_cancel_event.is_set():
-                        task_final_status = STATUS_CANCELLED
-                        error_msg = ""
-                    else:
-                        with self.queue_lock:
-                             last_error = self.tasks_info[next_task_id].get('error_message')
-                             internal_status = self.tasks_info[next_task_id].get('status')
-                        if last_error:
-                             task_final_status = STATUS_ERROR; error_msg = last_error
-                        elif internal_status == STATUS_ERROR:
-                             task_final_status = STATUS_ERROR; error_msg = "Download failed (check logs)"
-                        else:
-                             # <<< استخدام STATUS_COMPLETED المستورد من downloader_constants >>>
-                             task_final_status = STATUS_COMPLETED
-                             error_msg = ""
-
-                except DownloadCancelled as dc_e:
-                    print(f"Worker caught DownloadCancelled for task {next_task_id}: {dc_e}")
-                    task_final_status = STATUS_CANCELLED; error_msg = ""
-                except Exception as e:
-                    print(f"--- Worker Error Processing Task {next_task_id} ---"); traceback.print_exc(); print("---")
-                    task_final_status = STATUS_ERROR; error_msg = f"{type(e).__name__}: {e}"
-                    self._update_task_info(next_task_id, status=task_final_status, error_message=error_msg)
-                finally:
-                    print(f"Worker finished task {next_task_id} with status: {task_final_status}")
-                    self._update_task_info(next_task_id, status=task_final_status, progress=1.0 if task_final_status == STATUS_COMPLETED else None, error_message=error_msg if task_final_status == STATUS_ERROR else None)
-                    with self.queue_lock: self.running_task_id = None
-                    if self.queue_update_task_display_callback:
-                         # <<< تعديل لعرض رسالة الخطأ بشكل صحيح >>>
-                         display_msg = task_final_status if task_final_status != STATUS_ERROR else f"Error: {error_msg}"
-                         self.queue_update_task_display_callback(next_task_id, display_msg)
+                log.debug(LOG_WORKER_NEXT_TASK.format(task_id=next_task_id))
+                with self.queue_lock:
+                    # shutdown() may have started since the task was picked.
+                    if self._closing:
+                        self.running_task_ids.discard(next_task_id)
+                        break
+                    future = self._task_executor.submit(self._run_task, next_task_id, task_details)
+                    self._task_futures.add(future)
+                future.add_done_callback(self._discard_task_future)
             else:
                 time.sleep(0.5)
-        print(LOG_WORKER_STOP)
+        log.info(LOG_WORKER_STOP)
+
+    def _discard_task_future(self, future: concurrent.futures.Future) -> None:
+        with self.queue_lock:
+            self._task_futures.discard(future)
+
+    def _run_task(self, task_id: str, task_details: Dict[str, Any]) -> None:
+        """Runs one download task on a pool thread and records its final status."""
+        downloader_instance = None
+        # <<< استخدام STATUS_COMPLETED المستورد من downloader_constants >>>
+        task_final_status: str = STATUS_ERROR # Default to error
+        error_msg: str = "Unknown error during execution"
+
+        try:
+            task_cancel_event = task_details.get('cancel_event')
+            if not isinstance(task_cancel_event, threading.Event):
+                 raise ValueError("Invalid cancel_event found for task.")
+
+            downloader_instance = Downloader(
+                task_id=task_id, url=task_details['url'], save_path=task_details['save_path'],
+                format_choice=task_details['format_choice'], is_playlist=task_details['is_playlist'],
+                playlist_items=task_details['playlist_items'], selected_items_count=task_details['selected_count'],
+                total_playlist_count=task_details['total_count'], ffmpeg_path=self.ffmpeg_path,
+                cancel_event=task_cancel_event, status_callback=self._get_task_status_updater(task_id),
+                progress_callback=self._get_task_progress_updater(task_id), finished_callback=lambda: None,
+                max_parallel_videos=self.max_parallel_videos,
+                concurrent_fragments=self.concurrent_fragments,
+                use_aria2=self.use_aria2,
+                prefetched_info=task_details.get('prefetched_info'),
+                isolate_temp_dir=self.max_concurrent_tasks > 1,
+            )
+            downloader_instance.run()
+
+            if task_cancel_event.is_set():
+                task_final_status = STATUS_CANCELLED
+                error_msg = ""
+            else:
+                with self.queue_lock:
+                     last_error = self.tasks_info[task_id].get('error_message')
+                     internal_status = self.tasks_info[task_id].get('status')
+                if last_error:
+                     task_final_status = STATUS_ERROR; error_msg = last_error
+                elif internal_status == STATUS_ERROR:
+                     task_final_status = STATUS_ERROR; error_msg = "Download failed (check logs)"
+                else:
+                     # <<< استخدام STATUS_COMPLETED المستورد من downloader_constants >>>
+                     task_final_status = STATUS_COMPLETED
+                     error_msg = ""
+
+        except DownloadCancelled as dc_e:
+            log.info("Worker caught DownloadCancelled for task %s: %s", task_id, dc_e)
+            task_final_status = STATUS_CANCELLED; error_msg = ""
+        except Exception as e:
+            log.exception("Worker Error Processing Task %s", task_id)
+            task_final_status = STATUS_ERROR; error_msg = f"{type(e).__name__}: {e}"
+            self._update_task_info(task_id, status=task_final_status, error_message=error_msg)
+        finally:
+            log.debug("Worker finished task %s with status: %s", task_id, task_final_status)
+            self._update_task_info(task_id, status=task_final_status, progress=1.0 if task_final_status == STATUS_COMPLETED else None, error_message=error_msg if task_final_status == STATUS_ERROR else None)
+            with self.queue_lock: self.running_task_ids.discard(task_id)
+            if self.queue_update_task_display_callback:
+                 # <<< تعديل لعرض رسالة الخطأ بشكل صحيح >>>
+                 display_msg = task_final_status if task_final_status != STATUS_ERROR else f"Error: {error_msg}"
+                 self.queue_update_task_display_callback(task_id, display_msg)
 
     # --- Callback Wrappers ---
     def _get_task_status_updater(self, task_id: str) -> Callable[[str], None]:
@@ -232,26 +297,39 @@ class LogicHandler:
                         del kwargs['error_message']
                     self.tasks_info[task_id].update(kwargs)
 
-    def start_info_fetch(self, url: str) -> None:
-        """Starts the information fetching process (not queued)."""
+    def _is_fetch_running(self) -> bool:
+        return self.fetch_info_thread is not None and self.fetch_info_thread.is_alive()
+
+    def start_info_fetch(self, url: str, refresh: bool = False) -> None:
+        """
+        Starts the information fetching process (not queued).
+        refresh=True skips the metadata cache and re-extracts the URL.
+        """
         if not url:
             self.info_error_callback(ERROR_URL_EMPTY); self.finished_callback_main(); return
-        if self.fetch_info_thread and self.fetch_info_thread.is_alive():
+        if self._is_fetch_running():
             self.status_callback_main(ERROR_OPERATION_IN_PROGRESS); self.finished_callback_main(); return
-        print(LOG_INFO_FETCH_START)
+        log.info(LOG_INFO_FETCH_START)
         self.fetch_info_cancel_event.clear()
         fetcher_instance = InfoFetcher(
             url=url, cancel_event=self.fetch_info_cancel_event,
             success_callback=self.info_success_callback, error_callback=self.info_error_callback,
             status_callback=self.status_callback_main, progress_callback=self.progress_callback_main,
             finished_callback=self.finished_callback_main,
+            entries_callback=self.info_entries_callback,
+            use_cache=not refresh,
         )
         self.fetch_info_thread = threading.Thread(target=fetcher_instance.run, daemon=True); self.fetch_info_thread.start()
 
     def add_download_task(self, url: str, save_path: str, format_choice: str, is_playlist: bool,
                           playlist_items: Optional[str], selected_items_count: int,
-                          total_playlist_count: int, title: str) -> Optional[str]:
-        """Adds a new download task to the queue."""
+                          total_playlist_count: int, title: str,
+                          prefetched_info: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Adds a new download task to the queue.
+        prefetched_info: the fetched playlist info for this exact URL, if any; lets the
+        downloader skip re-extracting the playlist page.
+        """
         if not url or not save_path:
             self.status_callback_main(ERROR_URL_PATH_REQUIRED); return None
         task_id = str(uuid.uuid4())
@@ -261,16 +339,17 @@ class LogicHandler:
             'selected_count': selected_items_count, 'total_count': total_playlist_count,
             'title': title or "Untitled Download", 'status': STATUS_PENDING, 'progress': 0.0,
             'cancel_event': threading.Event(), 'error_message': None,
+            'prefetched_info': prefetched_info,
         }
         with self.queue_lock:
             self.tasks_info[task_id] = task_details; self.pending_tasks.append(task_id)
-            print(f"{LOG_DOWNLOAD_TASK_ADD} ID: {task_id}, Title: {task_details['title']}")
+            log.info("%s ID: %s, Title: %s", LOG_DOWNLOAD_TASK_ADD, task_id, task_details['title'])
         if self.queue_add_task_callback: self.queue_add_task_callback(task_id, task_details['title'], STATUS_PENDING)
         return task_id
 
     def get_queue_size(self) -> int:
         """Returns the current number of tasks (pending + running)."""
-        with self.queue_lock: size = len(self.pending_tasks) + (1 if self.running_task_id else 0)
+        with self.queue_lock: size = len(self.pending_tasks) + len(self.running_task_ids)
         return size
 
     def get_finished_task_ids(self) -> list[str]:
@@ -295,31 +374,31 @@ class LogicHandler:
                     if self.tasks_info[task_id].get('status') in [STATUS_COMPLETED, STATUS_ERROR, STATUS_CANCELLED]:
                        try: del self.tasks_info[task_id]; count += 1
                        except KeyError: pass # Handle potential race condition if removed between check and del
-                    else: print(f"LogicHandler Warning: Attempted to prune non-finished task {task_id}")
-            print(f"LogicHandler: Pruned data for {count} finished tasks.")
+                    else: log.warning("LogicHandler Warning: Attempted to prune non-finished task %s", task_id)
+            log.debug("LogicHandler: Pruned data for %d finished tasks.", count)
 
     def cancel_task(self, task_id: str) -> None:
         """Requests cancellation of a specific download task."""
-        print(LOG_CANCEL_REQUESTED.format(task_id=task_id))
+        log.info(LOG_CANCEL_REQUESTED.format(task_id=task_id))
         task_cancelled = False
         with self.queue_lock:
             task_info = self.tasks_info.get(task_id);
-            if not task_info: print(LOG_NO_TASK_TO_CANCEL.format(task_id=task_id)); return
+            if not task_info: log.info(LOG_NO_TASK_TO_CANCEL.format(task_id=task_id)); return
             status = task_info['status']
             cancel_event = task_info.get('cancel_event')
             if status == STATUS_PENDING:
-                print(LOG_CANCEL_PENDING.format(task_id=task_id))
+                log.info(LOG_CANCEL_PENDING.format(task_id=task_id))
                 try: self.pending_tasks.remove(task_id)
-                except ValueError: print(f"LogicHandler Warning: Task {task_id} not in pending deque.")
+                except ValueError: log.warning("LogicHandler Warning: Task %s not in pending deque.", task_id)
                 task_info['status'] = STATUS_CANCELLED; task_cancelled = True
                 if self.queue_update_task_display_callback: self.queue_update_task_display_callback(task_id, STATUS_CANCELLED)
             elif status in [STATUS_RUNNING, STATUS_DOWNLOADING, STATUS_PROCESSING]:
-                print(LOG_CANCEL_RUNNING.format(task_id=task_id))
+                log.info(LOG_CANCEL_RUNNING.format(task_id=task_id))
                 if isinstance(cancel_event, threading.Event):
                     task_info['status'] = STATUS_CANCELLING; cancel_event.set(); task_cancelled = True
                     if self.queue_update_task_display_callback: self.queue_update_task_display_callback(task_id, STATUS_CANCELLING)
                 else:
-                    print(f"LogicHandler Error: Invalid cancel_event for running task {task_id}")
+                    log.error("LogicHandler Error: Invalid cancel_event for running task %s", task_id)
                     task_info['status'] = STATUS_ERROR
                     task_info['error_message'] = "Internal cancel error"
                     if self.queue_update_task_display_callback:
@@ -327,31 +406,46 @@ class LogicHandler:
                             task_id, "Error: Internal cancel error"
                         )
             elif status in [STATUS_COMPLETED, STATUS_ERROR, STATUS_CANCELLED, STATUS_CANCELLING]:
-                 print(f"LogicHandler Info: Task {task_id} already {status}.")
-            else: print(f"LogicHandler Warning: Unknown status '{status}' for task {task_id} during cancel.")
+                 log.info("LogicHandler Info: Task %s already %s.", task_id, status)
+            else: log.warning("LogicHandler Warning: Unknown status '%s' for task %s during cancel.", status, task_id)
         if task_cancelled: self.status_callback_main(f"Cancellation requested for task {task_id}.")
 
     def cancel_fetch_info(self) -> None:
          """Cancels an ongoing Fetch Info operation."""
-         if self.fetch_info_thread and self.fetch_info_thread.is_alive():
-             print("LogicHandler: Cancelling Fetch Info operation.")
+         if self._is_fetch_running():
+             log.info("LogicHandler: Cancelling Fetch Info operation.")
              self.status_callback_main("Cancelling Fetch Info...")
              self.fetch_info_cancel_event.set()
-         else: print("LogicHandler: No Fetch Info operation running to cancel.")
+         else: log.info("LogicHandler: No Fetch Info operation running to cancel.")
 
     def shutdown(self) -> None:
-        """Signals the worker thread to stop and waits for it."""
-        print("LogicHandler: Shutdown requested.")
+        """Signals the worker thread and running tasks to stop and waits for them."""
+        log.info("LogicHandler: Shutdown requested.")
         self._stop_worker_event.set()
         with self.queue_lock:
-            if self.running_task_id and self.running_task_id in self.tasks_info: # Check existence
-                 print(f"LogicHandler: Cancelling running task {self.running_task_id} during shutdown.")
-                 cancel_event = self.tasks_info[self.running_task_id].get('cancel_event')
+            if self._closing:
+                return
+            self._closing = True
+            for running_id in self.running_task_ids:
+                 if running_id not in self.tasks_info: continue # Check existence
+                 log.info("LogicHandler: Cancelling running task %s during shutdown.", running_id)
+                 cancel_event = self.tasks_info[running_id].get('cancel_event')
                  if isinstance(cancel_event, threading.Event): cancel_event.set()
+            task_futures = list(self._task_futures)
+        # Nothing new can be submitted now; drop tasks that have not started.
+        self._task_executor.shutdown(wait=False, cancel_futures=True)
         if self.worker_thread and self.worker_thread.is_alive():
-            print("LogicHandler: Waiting for worker thread to finish...")
+            log.info("LogicHandler: Waiting for worker thread to finish...")
             self.worker_thread.join(timeout=5.0)
-            if self.worker_thread.is_alive(): print("LogicHandler Warning: Worker thread did not stop gracefully.")
-        print("LogicHandler: Shutdown complete.")
+            if self.worker_thread.is_alive(): log.warning("LogicHandler Warning: Worker thread did not stop gracefully.")
+        if task_futures:
+            log.info("LogicHandler: Waiting for %d running task(s) to finish...", len(task_futures))
+            _, not_done = concurrent.futures.wait(task_futures, timeout=5.0)
+            if not_done: log.warning("LogicHandler Warning: %d task(s) did not stop gracefully.", len(not_done))
+        if self._is_fetch_running():
+            self.fetch_info_cancel_event.set()  # daemon thread; stops at its next check
+        # Process-wide executors and the YoutubeDL pool outlive any one handler;
+        # main.py tears them down via shutdown_shared_resources() on exit.
+        log.info("LogicHandler: Shutdown complete.")
 
     def __del__(self): self.shutdown()
\ No newline at end of file
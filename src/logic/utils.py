@@ -3,8 +3,9 @@
 # -- Added image loading and processing utilities --
 
 import sys
-import re
 import os
+import functools
+import logging
 from pathlib import Path
 from typing import Optional, Union, Callable, Any
 import threading # For image loading thread
@@ -32,6 +33,8 @@ except ImportError as e:
     BytesIO = None
 
 
+log = logging.getLogger(__name__)
+
 # --- Constants ---
 TEMP_FOLDER_NAME = "ASF_TEMP"  # اسم المجلد المؤقت
 DEFAULT_THUMBNAIL_SIZE = (120, 67) # حجم مناسب للصور المصغرة (e.g., 16:9 ratio)
@@ -42,6 +45,7 @@ PLACEHOLDER_IMAGE_PATH = Path(__file__).parent.parent / "ui" / "assets" / "place
 # وسنتعامل مع الحالة التي لا يوجد فيها placeholder في الكود.
 
 _placeholder_ctk_image: Optional[Any] = None # لتخزين الصورة المؤقتة المحملة
+_temp_dir_cache: Optional[Path] = None # المجلد المؤقت بعد إنشائه أول مرة
 
 def get_placeholder_ctk_image(size: tuple = DEFAULT_THUMBNAIL_SIZE) -> Optional[Any]:
     """
@@ -151,9 +155,7 @@ def load_image_from_url_async(
         except Image.UnidentifiedImageError:
             print(f"Error: Cannot identify image file from {url}. Not a valid image format or corrupt.")
         except Exception as e:
-            print(f"Unexpected error loading image {url}: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Unexpected error loading image %s: %s", url, e)
 
         # Schedule the callback to be run in the main Tkinter thread
         if target_widget and hasattr(target_widget, 'after'):
@@ -228,6 +230,9 @@ def get_temp_dir() -> Optional[Path]:
     Returns:
         Optional[Path]: كائن Path للمجلد المؤقت، أو None إذا فشل الإنشاء.
     """
+    global _temp_dir_cache
+    if _temp_dir_cache is not None:
+        return _temp_dir_cache  # أنشئ مرة واحدة لكل عملية (yt-dlp يعيد إنشاءه عند الحاجة)
     try:
         user_home = Path.home()
         if not user_home.is_dir():
@@ -236,6 +241,7 @@ def get_temp_dir() -> Optional[Path]:
         temp_dir_path = user_home / TEMP_FOLDER_NAME
         temp_dir_path.mkdir(parents=True, exist_ok=True)
         print(f"Using temporary directory: {temp_dir_path}")
+        _temp_dir_cache = temp_dir_path
         return temp_dir_path
     except OSError as e:
         print(f"Error creating temporary directory '{temp_dir_path}': {e}")
@@ -245,6 +251,12 @@ def get_temp_dir() -> Optional[Path]:
         return None
 
 
+# أحرف غير مسموحة في أسماء الملفات، تحذف بتمريرة واحدة عبر str.translate
+_INVALID_FILENAME_CHARS_TABLE = str.maketrans("", "", '\\/*?:"<>|')
+FALLBACK_FILENAME = "downloaded_file"
+
+
+@functools.lru_cache(maxsize=256)  # hooks clean the same few titles repeatedly
 def clean_filename(filename: Optional[str]) -> str:
     """
     ينظف اسم الملف بإزالة الأحرف غير الصالحة واستبدال أخرى.
@@ -256,16 +268,11 @@ def clean_filename(filename: Optional[str]) -> str:
     Returns:
         str: The cleaned filename. Returns "downloaded_file" if empty or None input.
     """
-    INVALID_FILENAME_CHARS_REGEX = r'[\\/*?:"<>|]'
-    REPLACEMENT_CHAR = ""
-    FALLBACK_FILENAME = "downloaded_file"
-
     if not filename:
         return FALLBACK_FILENAME
 
-    cleaned = re.sub(INVALID_FILENAME_CHARS_REGEX, REPLACEMENT_CHAR, filename)
-    cleaned = cleaned.replace(":", " -")
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = filename.translate(_INVALID_FILENAME_CHARS_TABLE)
+    cleaned = " ".join(cleaned.split())  # collapse whitespace runs, strip ends
     cleaned = cleaned.rstrip(". ")
 
-    return cleaned or FALLBACK_FILENAME
\ No newline at end of file
+    return cleaned or FALLBACK_FILENAME
@@ -0,0 +1,151 @@
+# src/logic/ydl_pool.py
+# -- مجمع مشترك لنسخ YoutubeDL على مستوى العملية --
+# Purpose: Reuses YoutubeDL instances across fetches so extractor setup, cookies
+# and open connections survive between calls.
+# Instances are only closed by shutdown(). When a lease ends, the per-run state
+# a fresh instance would start without is reset (see _end_lease): the error
+# return code and the download counter behind %(autonumber)s; the cookie jar is
+# saved so a configured cookiefile is written per task, not only at exit.
+
+import contextlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yt_dlp
+from yt_dlp.version import __version__ as _YTDLP_VERSION
+
+log = logging.getLogger(__name__)
+
+# Idle (instance, hook slots) pairs keyed by their frozen options; an instance
+# is only ever used by one caller at a time (YoutubeDL is not thread-safe).
+# Keeping instances alive keeps their request handlers (and any open
+# keep-alive connections) across fetches and downloads.
+_Entry = Tuple[yt_dlp.YoutubeDL, Dict[str, Callable[[Dict[str, Any]], None]]]
+_idle: Dict[Any, List[_Entry]] = {}
+_lock = threading.Lock()
+_closed: bool = False
+
+_HOOK_KEYS = ("progress_hooks", "postprocessor_hooks")
+
+
+def _noop_hook(d: Dict[str, Any]) -> None:
+    return None
+
+
+def freeze_opts(value: Any) -> Any:
+    """Hashable snapshot of a ydl_opts value (nested dicts/lists -> tuples)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze_opts(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(freeze_opts(v) for v in value)
+    return value
+
+
+# Per-run counters a fresh YoutubeDL starts at 0 (private yt-dlp attributes;
+# requirements.txt pins the yt-dlp range they were checked against).
+_RUN_COUNTERS = ("_download_retcode", "_num_downloads")
+_counters_missing_logged: bool = False
+
+
+def _end_lease(ydl: yt_dlp.YoutubeDL) -> bool:
+    """
+    Makes a returned instance behave like a fresh one for the next caller.
+    Returns False if that is not possible (yt-dlp renamed a counter); the
+    caller then closes the instance instead of pooling it.
+    """
+    global _counters_missing_logged
+    missing = [attr for attr in _RUN_COUNTERS if not hasattr(ydl, attr)]
+    if missing:
+        if not _counters_missing_logged:
+            _counters_missing_logged = True
+            log.warning(
+                "ydl_pool: yt-dlp %s has no %s; YoutubeDL instances will not be reused.",
+                _YTDLP_VERSION,
+                ", ".join(missing),
+            )
+    else:
+        for attr in _RUN_COUNTERS:
+            setattr(ydl, attr, 0)
+    save_cookies = getattr(ydl, "save_cookies", None)
+    if save_cookies is not None:
+        try:
+            save_cookies()  # no-op unless a cookiefile is configured
+        except Exception as e:
+            log.warning("ydl_pool: Could not save cookies: %s", e)
+    return not missing
+
+
+def _close(ydl: yt_dlp.YoutubeDL) -> None:
+    try:
+        ydl.close()
+    except Exception as e:
+        log.warning("ydl_pool: Error closing YoutubeDL: %s", e)
+
+
+@contextlib.contextmanager
+def lease(
+    ydl_opts: Dict[str, Any],
+    progress_hook: Optional[Callable[[Dict[str, Any]], None]] = None,
+    postprocessor_hook: Optional[Callable[[Dict[str, Any]], None]] = None,
+    per_call: Iterable[str] = (),
+) -> Iterator[yt_dlp.YoutubeDL]:
+    """
+    Yields an idle YoutubeDL built with ydl_opts, creating one if none is free.
+    Hooks go through per-instance slots because yt-dlp copies postprocessor
+    hooks into each postprocessor at construction time. Keys named in per_call
+    (e.g. the playlist selection) are set on the live params for this lease
+    only and are not part of the pool key.
+    """
+    per_call = tuple(per_call)
+    base = {
+        k: v for k, v in ydl_opts.items() if k not in per_call and k not in _HOOK_KEYS
+    }
+    key = freeze_opts(base)
+    with _lock:
+        idle = _idle.get(key)
+        entry = idle.pop() if idle else None
+    if entry is None:
+        slots: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        ydl = yt_dlp.YoutubeDL(
+            {
+                **base,
+                "progress_hooks": [lambda d: slots["progress"](d)],
+                "postprocessor_hooks": [lambda d: slots["postprocessor"](d)],
+            }
+        )
+        entry = (ydl, slots)
+    ydl, slots = entry
+    slots["progress"] = progress_hook or _noop_hook
+    slots["postprocessor"] = postprocessor_hook or _noop_hook
+    for k in per_call:
+        ydl.params.pop(k, None)
+        if k in ydl_opts:
+            ydl.params[k] = ydl_opts[k]
+    try:
+        yield ydl
+    finally:
+        # Drop per-lease state so idle instances hold no task references.
+        slots["progress"] = slots["postprocessor"] = _noop_hook
+        for k in per_call:
+            ydl.params.pop(k, None)
+        reusable = _end_lease(ydl)
+        with _lock:
+            keep = reusable and not _closed
+            if keep:
+                _idle.setdefault(key, []).append(entry)
+        if not keep:
+            _close(ydl)
+
+
+def shutdown() -> None:
+    """Closes every pooled instance; called once on application exit."""
+    global _closed
+    with _lock:
+        _closed = True
+        instances = [ydl for idle in _idle.values() for ydl, _ in idle]
+        _idle.clear()
+    for ydl in instances:
+        _close(ydl)
+    if instances:
+        log.info("ydl_pool: Closed %d pooled YoutubeDL instance(s).", len(instances))
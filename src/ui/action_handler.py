@@ -7,6 +7,8 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from typing import TYPE_CHECKING, Optional, Dict, Any, Callable
 
+from src.logic.info_fetcher import INFO_FROM_CACHE_KEY
+
 # --- Imports ---
 if TYPE_CHECKING:
     import customtkinter as ctk
@@ -140,8 +142,16 @@ class UIActionHandlerMixin:
             messagebox.showwarning("Busy", "Already fetching information.")
             return
 
+        # Fetching the URL that is already shown again acts as "refresh": it
+        # bypasses the metadata cache so a changed playlist/channel is re-listed.
+        refresh: bool = bool(self.fetched_info) and url in (
+            self.fetched_info.get("original_url"),
+            self.fetched_info.get("webpage_url"),
+        )
+
         self.fetched_info = None
         self.playlist_selector_widget.grid_remove()
+        self.playlist_selector_widget.reset()  # streamed entries start from empty
         if hasattr(self, "single_video_thumbnail_label"):
             self.single_video_thumbnail_label.grid_remove()
         self.dynamic_area_label.configure(text=LABEL_EMPTY)
@@ -152,7 +162,7 @@ class UIActionHandlerMixin:
 
         if self.logic:
             self._current_fetch_url = url
-            self.logic.start_info_fetch(url)
+            self.logic.start_info_fetch(url, refresh=refresh)
         else:
             self._handle_missing_logic_handler()
 
@@ -230,6 +240,23 @@ class UIActionHandlerMixin:
             messagebox.showerror(TITLE_LOGIC_ERROR, MSG_MISMATCH_STATE)
             return
 
+        # Reuse the fetched playlist info only if it belongs to the URL being queued
+        # (the URL entry stays editable after fetching). Single videos are always
+        # re-extracted: their format URLs expire while the task waits in the queue.
+        # Listings served from the metadata cache may be hours old, so the
+        # downloader re-lists those playlists itself.
+        prefetched_info: Optional[Dict[str, Any]] = None
+        if (
+            add_as_playlist
+            and not self.fetched_info.get(INFO_FROM_CACHE_KEY)
+            and url
+            in (
+                self.fetched_info.get("original_url"),
+                self.fetched_info.get("webpage_url"),
+            )
+        ):
+            prefetched_info = self.fetched_info
+
         # --- Add Task to Logic Handler Queue ---
         if self.logic:
             print(f"UI: Calling logic.add_download_task for '{task_title}'")
@@ -242,6 +269,7 @@ class UIActionHandlerMixin:
                 selected_items_count=selected_items_count,
                 total_playlist_count=total_playlist_count,
                 title=task_title,
+                prefetched_info=prefetched_info,
             )
 
             if task_id:
@@ -4,7 +4,7 @@
 
 import contextlib
 from tkinter import messagebox
-from typing import TYPE_CHECKING, Callable, Dict, Any, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional
 
 # --- Type Hinting ---
 if TYPE_CHECKING:
@@ -24,6 +24,7 @@ COLOR_DEFAULT = "gray"
 
 # Import queue statuses for logic within this handler if needed (e.g. on_task_finished)
 from .queue_tab import STATUS_COMPLETED, STATUS_ERROR, STATUS_CANCELLED
+from .action_handler import OP_FETCH
 
 
 class UICallbackHandlerMixin:
@@ -47,6 +48,7 @@ class UICallbackHandlerMixin:
         history_manager: Optional[Any]  # HistoryManager type
         logic: Optional[Any]  # LogicHandler type
         _current_fetch_url: Optional[str]
+        playlist_selector_widget: Any  # PlaylistSelector
 
     # --- Callback Methods ---
 
@@ -212,6 +214,21 @@ class UICallbackHandlerMixin:
 
         self.after(0, _update)
 
+    def on_info_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """Callback for a batch of playlist entries streamed during a fetch."""
+
+        def _update() -> None:
+            if self.current_operation != OP_FETCH or self.fetched_info is not None:
+                return  # fetch already finished or was abandoned
+            selector = self.playlist_selector_widget
+            selector.append_items(entries)
+            selector.grid(row=4, column=0, padx=20, pady=(5, 10), sticky="nsew")
+            self.update_status(
+                f"Fetching information... {len(selector.item_widgets_data)} items so far"
+            )
+
+        self.after(0, _update)
+
     def on_info_error(self, error_message: str) -> None:
         """Callback for failed info fetch."""
 
@@ -59,6 +59,8 @@ class PlaylistSelector(ctk.CTkScrollableFrame):
         self.deselect_all_button.pack(side="left", padx=5)
 
         self.placeholder_ctk_image = get_placeholder_ctk_image(THUMBNAIL_SIZE)
+        # ids of the rows added by append_items() during the current fetch
+        self._streamed_ids: List[Optional[str]] = []
 
         self.disable()
 
@@ -86,9 +88,23 @@ class PlaylistSelector(ctk.CTkScrollableFrame):
                         print(f"Error destroying playlist item checkbox: {e}")
 
         self.item_widgets_data = []
+        self._streamed_ids = []
         self.disable()
 
     def populate_items(self, entries: List[Optional[Dict[str, Any]]]) -> None:
+        # Entries streamed in while fetching are the same leading items; only
+        # render what is missing instead of rebuilding every row.
+        streamed = self._streamed_ids
+        self._streamed_ids = []
+        if streamed and len(streamed) <= len(entries) and streamed == [
+            entry.get("id") if isinstance(entry, dict) else None
+            for entry in entries[: len(streamed)]
+        ]:
+            for index in range(len(streamed), len(entries)):
+                self._add_item(index, entries[index])
+            self.enable()
+            return
+
         self.clear_items()
 
         if not entries:
@@ -102,60 +118,70 @@ class PlaylistSelector(ctk.CTkScrollableFrame):
         # print(f"PlaylistSelector: Populating with {len(entries)} items.") # يمكن إلغاء هذا للتقليل من المخرجات
 
         for index, entry in enumerate(entries):
-            if not entry or not isinstance(entry, dict):
-                # print(f"PlaylistSelector: Skipping invalid entry at index {index}: {entry}")
-                continue
-
-            video_index: int = entry.get("playlist_index") or (index + 1)
-            title: str = entry.get("title") or f"Video {video_index} (Untitled)"
-            display_title: str = (
-                f"{title[:TITLE_MAX_LEN]}..." if len(title) > TITLE_MAX_LEN else title
-            )
-            thumbnail_url: Optional[str] = entry.get("thumbnail_url")
+            self._add_item(index, entry)
+
+    def append_items(self, entries: List[Dict[str, Any]]) -> None:
+        """Adds a batch of entries streamed during a fetch; stays disabled."""
+        for entry in entries:
+            self._add_item(len(self._streamed_ids), entry)
+            self._streamed_ids.append(entry.get("id"))
+        self.disable()
 
-            item_frame = ctk.CTkFrame(self, fg_color="transparent")
-            item_frame.pack(anchor="w", padx=5, pady=(3, 3), fill="x") # جعل الإطار يملأ العرض
+    def _add_item(self, index: int, entry: Optional[Dict[str, Any]]) -> None:
+        if not entry or not isinstance(entry, dict):
+            # print(f"PlaylistSelector: Skipping invalid entry at index {index}: {entry}")
+            return
 
-            thumbnail_label = ctk.CTkLabel(
-                item_frame,
-                text="",
-                image=self.placeholder_ctk_image,
-                width=THUMBNAIL_SIZE[0],
-                height=THUMBNAIL_SIZE[1],
-            )
-            thumbnail_label.pack(side="left", padx=(0, 10))
-
-            var = ctk.StringVar(value=CHECKBOX_ON)
-            # --- !!! إزالة wraplength من CTkCheckBox !!! ---
-            cb = ctk.CTkCheckBox(
-                item_frame,
-                text=f"{video_index}. {display_title}",
-                variable=var,
-                onvalue=CHECKBOX_ON,
-                offvalue=CHECKBOX_OFF,
-                # anchor="w" # CTkCheckbox يتم محاذاته لليسار افتراضيًا داخل pack
+        video_index: int = entry.get("playlist_index") or (index + 1)
+        title: str = entry.get("title") or f"Video {video_index} (Untitled)"
+        display_title: str = (
+            f"{title[:TITLE_MAX_LEN]}..." if len(title) > TITLE_MAX_LEN else title
+        )
+        thumbnail_url: Optional[str] = entry.get("thumbnail_url")
+
+        item_frame = ctk.CTkFrame(self, fg_color="transparent")
+        item_frame.pack(anchor="w", padx=5, pady=(3, 3), fill="x") # جعل الإطار يملأ العرض
+
+        thumbnail_label = ctk.CTkLabel(
+            item_frame,
+            text="",
+            image=self.placeholder_ctk_image,
+            width=THUMBNAIL_SIZE[0],
+            height=THUMBNAIL_SIZE[1],
+        )
+        thumbnail_label.pack(side="left", padx=(0, 10))
+
+        var = ctk.StringVar(value=CHECKBOX_ON)
+        # --- !!! إزالة wraplength من CTkCheckBox !!! ---
+        cb = ctk.CTkCheckBox(
+            item_frame,
+            text=f"{video_index}. {display_title}",
+            variable=var,
+            onvalue=CHECKBOX_ON,
+            offvalue=CHECKBOX_OFF,
+            # anchor="w" # CTkCheckbox يتم محاذاته لليسار افتراضيًا داخل pack
+        )
+        # اجعل مربع الاختيار يتمدد ليملأ المساحة المتبقية
+        cb.pack(side="left", anchor="w", expand=True, fill="x", padx=(0,5))
+
+
+        self.item_widgets_data.append((thumbnail_label, cb, var, video_index))
+
+        if thumbnail_url:
+            def _update_thumbnail_callback(
+                loaded_image: Optional[Any], label_to_update=thumbnail_label
+            ):
+                if label_to_update.winfo_exists() and loaded_image:
+                    label_to_update.configure(image=loaded_image)
+
+            # استخدم self (الـ PlaylistSelector) كـ target_widget
+            # لأنه موجود دائمًا عندما تكون هذه الدالة تُستدعى
+            load_image_from_url_async(
+                thumbnail_url,
+                _update_thumbnail_callback,
+                target_widget=self, # استخدام self هنا ( PlaylistSelector )
+                target_size=THUMBNAIL_SIZE,
             )
-            # اجعل مربع الاختيار يتمدد ليملأ المساحة المتبقية
-            cb.pack(side="left", anchor="w", expand=True, fill="x", padx=(0,5))
-
-
-            self.item_widgets_data.append((thumbnail_label, cb, var, video_index))
-
-            if thumbnail_url:
-                def _update_thumbnail_callback(
-                    loaded_image: Optional[Any], label_to_update=thumbnail_label
-                ):
-                    if label_to_update.winfo_exists() and loaded_image:
-                        label_to_update.configure(image=loaded_image)
-
-                # استخدم self (الـ PlaylistSelector) كـ target_widget
-                # لأنه موجود دائمًا عندما تكون هذه الدالة تُستدعى
-                load_image_from_url_async(
-                    thumbnail_url,
-                    _update_thumbnail_callback,
-                    target_widget=self, # استخدام self هنا ( PlaylistSelector )
-                    target_size=THUMBNAIL_SIZE,
-                )
         
         # self.update_idletasks() # قد لا يكون ضروريًا هنا دائمًا، ولكن لا يضر
         # print("PlaylistSelector: Finished packing items with thumbnails.") # يمكن إلغاؤه